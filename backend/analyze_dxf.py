@@ -1,18 +1,45 @@
 #!/usr/bin/env python3
-"""Analyze DXF file format and structure"""
+"""Analyze DXF file format and structure
+
+Usage: python analyze_dxf.py <dxf_file> [--full]
+The summary comes from a streaming tag scan, so multi-million-point files are fine.
+--full also loads the file with ezdxf to show header variables, sample entities and the layer table.
+"""
 
 import sys
 import ezdxf
-from collections import Counter
 
-def analyze_dxf(filepath):
+from dxf_scan import analyze_dxf as scan_analysis
+
+def analyze_dxf(filepath, full=False):
     """Analyze a DXF file and print its structure"""
     try:
-        doc = ezdxf.readfile(filepath)
+        analysis, method = scan_analysis(filepath)
         
         print(f"\n=== DXF File Analysis: {filepath} ===")
-        print(f"DXF Version: {doc.dxfversion}")
-        print(f"Created by: {doc.header.get('$ACADVER', 'Unknown')}")
+        print(f"DXF Version: {analysis['dxf_version']}")
+        print(f"Analyzed with: {method}")
+        
+        print("\n=== Entity Statistics ===")
+        for entity_type, count in analysis['entity_types'].items():
+            print(f"{entity_type}: {count}")
+        
+        print("\n=== Entities per Layer ===")
+        for layer, count in analysis['layers'].items():
+            print(f"{layer}: {count}")
+        
+        bounds = analysis['bounds']
+        if bounds:
+            print(f"\n=== Point Cloud Bounds ({analysis['point_count']} points) ===")
+            print(f"X: {bounds['x']['min']:.3f} to {bounds['x']['max']:.3f} (width: {bounds['x']['range']:.3f})")
+            print(f"Y: {bounds['y']['min']:.3f} to {bounds['y']['max']:.3f} (height: {bounds['y']['range']:.3f})")
+            print(f"Z: {bounds['z']['min']:.3f} to {bounds['z']['max']:.3f} (depth: {bounds['z']['range']:.3f})")
+        
+        if not full:
+            return True
+        
+        doc = ezdxf.readfile(filepath)
+        print(f"\nCreated by: {doc.header.get('$ACADVER', 'Unknown')}")
         
         # Analyze header variables
         print("\n=== Important Header Variables ===")
@@ -22,37 +49,8 @@ def analyze_dxf(filepath):
             if var in doc.header:
                 print(f"{var}: {doc.header[var]}")
         
-        # Count entities
-        msp = doc.modelspace()
-        entity_types = Counter()
-        
-        print("\n=== Entity Statistics ===")
-        min_x = min_y = min_z = float('inf')
-        max_x = max_y = max_z = float('-inf')
-        
-        for entity in msp:
-            entity_types[entity.dxftype()] += 1
-            
-            # Get bounds for POINT entities
-            if entity.dxftype() == 'POINT':
-                x, y, z = entity.dxf.location
-                min_x = min(min_x, x)
-                max_x = max(max_x, x)
-                min_y = min(min_y, y)
-                max_y = max(max_y, y)
-                min_z = min(min_z, z)
-                max_z = max(max_z, z)
-        
-        for entity_type, count in entity_types.most_common():
-            print(f"{entity_type}: {count}")
-        
-        if entity_types.get('POINT', 0) > 0:
-            print(f"\n=== Point Cloud Bounds ===")
-            print(f"X: {min_x:.3f} to {max_x:.3f} (width: {max_x - min_x:.3f})")
-            print(f"Y: {min_y:.3f} to {max_y:.3f} (height: {max_y - min_y:.3f})")
-            print(f"Z: {min_z:.3f} to {max_z:.3f} (depth: {max_z - min_z:.3f})")
-        
         # Sample first few entities
+        msp = doc.modelspace()
         print("\n=== First 5 Entities ===")
         for i, entity in enumerate(msp):
             if i >= 5:
@@ -73,7 +71,7 @@ def analyze_dxf(filepath):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python analyze_dxf.py <dxf_file>")
+        print("Usage: python analyze_dxf.py <dxf_file> [--full]")
         sys.exit(1)
     
-    analyze_dxf(sys.argv[1])
\ No newline at end of file
+    analyze_dxf(sys.argv[1], full="--full" in sys.argv[2:])
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Content-addressed artifact store for Crystal Etching Converter
+Derives conversion ids from what was converted and how, so identical requests share one set of files
+"""
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ARTIFACT_STORE_DIR = Path(os.getenv("ARTIFACT_STORE_DIR", "artifacts"))
+ARTIFACT_VERSION = 1  # Bump whenever depth map or DXF output changes for the same inputs
+
+ORIGINALS_DIR = ARTIFACT_STORE_DIR / "originals"
+UPLOADS_DIR = ARTIFACT_STORE_DIR / "uploads"
+
+_store_lock = threading.Lock()
+
+
+def _digest(value: Dict) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def conversion_id(content_hash: str, pipeline: Dict, params: Dict) -> str:
+    """UUID-formatted id from hash(original) + hash(pipeline setup) + hash(parameters)"""
+    key = f"{ARTIFACT_VERSION}:{content_hash}:{_digest(pipeline)}:{_digest(params)}"
+    return str(uuid.UUID(hashlib.sha256(key.encode()).hexdigest()[:32]))
+
+
+def new_upload_path(suffix: str) -> Path:
+    """Scratch path for an upload whose content hash is not known yet"""
+    UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    return UPLOADS_DIR / f"{uuid.uuid4()}{suffix}"
+
+
+def store_original(upload_path: Path, content_hash: str, link_path: Path) -> None:
+    """Keep one copy of the upload per content hash and hard-link it at link_path"""
+    blob_path = ORIGINALS_DIR / f"{content_hash}{upload_path.suffix.lower()}"
+    with _store_lock:
+        ORIGINALS_DIR.mkdir(parents=True, exist_ok=True)
+        if blob_path.exists():
+            upload_path.unlink()
+        else:
+            os.replace(upload_path, blob_path)
+
+        if link_path.exists():
+            return
+        try:
+            os.link(blob_path, link_path)
+        except OSError:
+            # Store and static on different filesystems, or no hard-link support
+            shutil.copy2(blob_path, link_path)
+
+
+def prune_original(content_hash: str, suffix: str) -> bool:
+    """Drop the stored original for this content once no static file links to it"""
+    blob_path = ORIGINALS_DIR / f"{content_hash}{suffix.lower()}"
+    with _store_lock:
+        if blob_path.exists() and blob_path.stat().st_nlink <= 1:
+            blob_path.unlink()
+            return True
+    return False
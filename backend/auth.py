@@ -2,14 +2,19 @@
 Authentication and authorization for Crystal Etching Converter
 """
 import os
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from database import get_db, User
+from password_hashing import hash_password, check_password, needs_rehash, run_password_job, login_slot
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,6 +25,12 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-product
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
 
+# Authenticated-user cache
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 30))  # Seconds, 0 disables
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", 10000))
+# Trust user claims in the token and skip the database; deactivation then only applies once the token expires
+AUTH_TOKEN_CLAIMS = os.getenv("AUTH_TOKEN_CLAIMS", "false").lower() == "true"
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -51,6 +62,76 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
+class AuthenticatedUser(UserResponse):
+    """Request principal, detached from any database session so it can be cached"""
+
+class UserCache:
+    """LRU of authenticated users keyed by token subject, with a TTL and hit/miss counters"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # email -> (user, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.claim_logins = 0
+
+    def get(self, email: str) -> Optional[AuthenticatedUser]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry and time.monotonic() - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(email)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._entries[email]
+            self.misses += 1
+            return None
+
+    def put(self, user: AuthenticatedUser) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries.pop(user.email, None)
+            self._entries[user.email] = (user, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_claim_login(self) -> None:
+        with self._lock:
+            self.claim_logins += 1
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            if self._entries.pop(email, None):
+                self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "claim_logins": self.claim_logins,
+                "token_claims": AUTH_TOKEN_CLAIMS,
+            }
+
+user_cache = UserCache(AUTH_CACHE_TTL, AUTH_CACHE_MAX_ENTRIES)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    """Drop a user from this process's cache when the row changes; other workers catch up within the TTL"""
+    user_cache.invalidate(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted:
+        user_cache.invalidate(old_email)
+
 # Authentication functions
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -64,17 +145,57 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str, credentials_exception):
-    """Verify JWT token"""
+def token_claims(user: User) -> dict:
+    """Token payload for a user: the email subject, plus the user's fields if AUTH_TOKEN_CLAIMS is on"""
+    claims = {"sub": user.email}
+    if AUTH_TOKEN_CLAIMS:
+        claims.update({
+            "uid": user.id,
+            "username": user.username,
+            "is_active": user.is_active,
+            "is_admin": user.is_admin,
+            "created_at": user.created_at.isoformat(),
+        })
+    return claims
+
+def decode_token(token: str, credentials_exception) -> dict:
+    """Verify a JWT and return its payload"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    return token_data
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+def verify_token(token: str, credentials_exception):
+    """Verify JWT token"""
+    return TokenData(email=decode_token(token, credentials_exception)["sub"])
+
+def resolve_user(token: str, db: Session, credentials_exception) -> Optional[AuthenticatedUser]:
+    """User for a token from its claims, the cache or, failing both, the database"""
+    payload = decode_token(token, credentials_exception)
+    email = payload["sub"]
+
+    if AUTH_TOKEN_CLAIMS and "uid" in payload:
+        user_cache.record_claim_login()
+        return AuthenticatedUser(
+            id=payload["uid"],
+            email=email,
+            username=payload["username"],
+            is_active=payload["is_active"],
+            is_admin=payload["is_admin"],
+            created_at=payload["created_at"]
+        )
+
+    user = user_cache.get(email)
+    if user is None:
+        db_user = db.query(User).filter(User.email == email).first()
+        if db_user is None:
+            return None
+        user = AuthenticatedUser.model_validate(db_user)
+        user_cache.put(user)
+    return user
 
 def get_current_user_optional(token: Optional[str] = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     """Get current authenticated user (optional - returns None if not authenticated)"""
@@ -88,9 +209,7 @@ def get_current_user_optional(token: Optional[str] = Depends(oauth2_scheme), db:
     )
     
     try:
-        token_data = verify_token(token, credentials_exception)
-        user = db.query(User).filter(User.email == token_data.email).first()
-        return user
+        return resolve_user(token, db, credentials_exception)
     except:
         return None
 
@@ -102,9 +221,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token_data = verify_token(token, credentials_exception)
-    user = db.query(User).filter(User.email == token_data.email).first()
-    
+    user = resolve_user(token, db, credentials_exception)
     if user is None:
         raise credentials_exception
     return user
@@ -124,16 +241,21 @@ def get_current_admin_user(current_user: User = Depends(get_current_active_user)
         )
     return current_user
 
-def authenticate_user(db: Session, email: str, password: str):
-    """Authenticate user with email and password"""
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        return False
-    if not user.verify_password(password):
-        return False
-    return user
+async def authenticate_user(db: Session, email: str, password: str, client_ip: str):
+    """Authenticate user with email and password, upgrading the hash to the current bcrypt cost"""
+    async with login_slot(email, client_ip):
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            return False
+        if not await run_password_job(check_password, password, user.password_hash):
+            return False
+        
+        if needs_rehash(user.password_hash):
+            user.password_hash = await run_password_job(hash_password, password)
+            db.commit()
+        return user
 
-def create_user(db: Session, user_create: UserCreate):
+async def create_user(db: Session, user_create: UserCreate, client_ip: str):
     """Create new user"""
     # Check if user exists
     existing_user = db.query(User).filter(
@@ -159,7 +281,8 @@ def create_user(db: Session, user_create: UserCreate):
         is_active=True,
         is_admin=False
     )
-    db_user.set_password(user_create.password)
+    async with login_slot(user_create.email, client_ip):
+        db_user.password_hash = await run_password_job(hash_password, user_create.password)
     
     db.add(db_user)
     db.commit()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Benchmark the background-threshold checkerboard against the per-tile loop
+
+Usage: python benchmarks/bench_background_pattern.py [size] [repeats]
+Timing only; test_background_pattern.py checks that both give the same pixels.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from depth_processing import background_pattern_mask
+
+
+def loop_pattern(processed, threshold):
+    """Previous implementation from apply_depth_parameters"""
+    vis_copy = processed.copy()
+    mask = processed <= threshold
+    for y in range(0, processed.shape[0], 10):
+        for x in range(0, processed.shape[1], 10):
+            if mask[y:min(y+5, processed.shape[0]), x:min(x+5, processed.shape[1])].any():
+                vis_copy[y:min(y+5, processed.shape[0]), x:min(x+5, processed.shape[1])] = 0
+    return vis_copy
+
+
+def vectorized_pattern(processed, threshold):
+    vis_copy = processed.copy()
+    vis_copy[background_pattern_mask(processed <= threshold)] = 0
+    return vis_copy
+
+
+def time_call(func, *args, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(*args)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    yy, xx = np.mgrid[0:size, 0:size]
+    depth = np.clip(255 - np.hypot(xx - size / 2, yy - size / 2) / size * 2 * 255, 0, 255).astype(np.uint8)
+
+    loop_time = time_call(loop_pattern, depth, 10, repeats=repeats)
+    vectorized_time = time_call(vectorized_pattern, depth, 10, repeats=repeats)
+
+    print(f"Depth map: {size}x{size}")
+    print(f"Per-tile loop: {loop_time * 1000:.1f} ms")
+    print(f"Block-reduced: {vectorized_time * 1000:.1f} ms")
+    print(f"Speedup: {loop_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
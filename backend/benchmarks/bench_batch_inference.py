@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Benchmark batched Depth Anything inference against one image at a time
+
+Usage: python benchmarks/bench_batch_inference.py [image_count] [batch_size]
+Uses the sample photos in dev_files/ at two 4:3 sizes that share one model
+input shape, as estimate_raw_depth_batch buckets them, and reports how far
+batched depth strays from one-at-a-time depth (should be a level or two).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from main import get_depth_estimator, infer_depth
+from depth_processing import model_input_size
+
+DEV_FILES = BACKEND_DIR.parent / "dev_files"
+IMAGE_SIZES = [(1024, 768), (800, 600)]
+
+
+def load_images(count):
+    """Cycle through dev_files samples, mirroring alternate copies so inputs differ"""
+    samples = [Image.open(path).convert("RGB") for path in sorted(DEV_FILES.glob("*.png"))]
+    images = []
+    for index in range(count):
+        image = samples[index % len(samples)].resize(IMAGE_SIZES[index % len(IMAGE_SIZES)])
+        images.append(ImageOps.mirror(image) if (index // len(samples)) % 2 else image)
+    return images
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    images = load_images(count)
+
+    get_depth_estimator()
+    infer_depth(images[:1])  # Warm-up
+
+    start = time.perf_counter()
+    single = [infer_depth([image])[0] for image in images]
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = []
+    for offset in range(0, count, batch_size):
+        batch.extend(infer_depth(images[offset:offset + batch_size]))
+    batched = time.perf_counter() - start
+
+    drift = max(np.abs(a.astype(np.int16) - b.astype(np.int16)).max() for a, b in zip(single, batch))
+    sizes = ", ".join(f"{w}x{h}" for w, h in IMAGE_SIZES)
+    print(f"Images: {count} at {sizes}, model input {model_input_size(IMAGE_SIZES[0])}")
+    print(f"Batched vs one at a time: max depth difference {drift} levels")
+    print(f"One at a time: {sequential:.2f}s ({count / sequential:.2f} images/s)")
+    print(f"Batch size {batch_size}: {batched:.2f}s ({count / batched:.2f} images/s)")
+    print(f"Speedup: {sequential / batched:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark depth backends against the fp32 pipeline on the dev_files samples
+
+Usage: python benchmarks/bench_depth_backends.py [repeats]
+The onnx rows need export_depth_model.py to have been run first; missing ones are skipped.
+Each backend runs in its own process so load time and peak RSS are measured independently.
+"""
+
+import sys
+import time
+import resource
+import multiprocessing
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import numpy as np
+from PIL import Image
+
+from depth_backends import (
+    PipelineBackend, QuantizedTorchBackend, OnnxBackend, normalize_depth, ONNX_MODEL_PATH
+)
+
+DEV_FILES = BACKEND_DIR.parent / "dev_files"
+ONNX_INT8_PATH = str(Path(ONNX_MODEL_PATH).with_name(Path(ONNX_MODEL_PATH).stem + "_int8.onnx"))
+
+CANDIDATES = [
+    ("pipeline fp32", PipelineBackend, ()),
+    ("torch int8", QuantizedTorchBackend, ()),
+    ("onnx fp32", OnnxBackend, (ONNX_MODEL_PATH,)),
+    ("onnx int8", OnnxBackend, (ONNX_INT8_PATH,)),
+]
+
+
+def load_images():
+    return [Image.open(path).convert("RGB") for path in sorted(DEV_FILES.glob("*.png"))]
+
+
+def run(index, repeats, queue):
+    name, backend_class, args = CANDIDATES[index]
+    images = load_images()
+    try:
+        start = time.perf_counter()
+        backend = backend_class(*args)
+        load_time = time.perf_counter() - start
+    except Exception as e:
+        queue.put((name, None, str(e)))
+        return
+
+    depths = [normalize_depth(backend.estimate_depth(image)) for image in images]  # Warm-up and outputs
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for image in images:
+            backend.estimate_depth(image)
+    latency = (time.perf_counter() - start) / (repeats * len(images))
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((name, (load_time, latency, peak_rss, depths), None))
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"Images: {', '.join(path.name for path in sorted(DEV_FILES.glob('*.png')))}")
+
+    queue = multiprocessing.Queue()
+    baseline = None
+    for index in range(len(CANDIDATES)):
+        proc = multiprocessing.Process(target=run, args=(index, repeats, queue))
+        proc.start()
+        name, result, error = queue.get()
+        proc.join()
+
+        print(f"\n=== {name} ===")
+        if result is None:
+            print(f"Skipped: {error}")
+            continue
+
+        load_time, latency, peak_rss, depths = result
+        print(f"Load: {load_time:.2f}s")
+        print(f"Latency: {latency * 1000:.0f} ms/image")
+        # ru_maxrss is in KB on Linux
+        print(f"Peak RSS: {peak_rss / 1024:.0f} MB")
+
+        if baseline is None:
+            baseline = depths
+            continue
+        errors = [np.abs(depth.astype(np.int16) - base.astype(np.int16)) for depth, base in zip(depths, baseline)]
+        print(f"Depth error vs fp32: mean {np.mean([e.mean() for e in errors]):.2f}, "
+              f"max {max(int(e.max()) for e in errors)} grey levels")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark the streaming DXF scanner against ezdxf's full parse
+
+Usage: python benchmarks/bench_dxf_analysis.py [size | file.dxf]
+With a size, a synthetic point cloud DXF is written first. Each analyzer runs
+in its own process so peak RSS is measured independently, and the two
+analyses must agree.
+"""
+
+import sys
+import time
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from dxf_scan import scan_dxf, analyze_with_ezdxf
+from dxf_writer import write_points_dxf
+
+
+def run(analyzer_name, dxf_path, queue):
+    analyzers = {'streaming scan': scan_dxf, 'ezdxf readfile': analyze_with_ezdxf}
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    analysis = analyzers[analyzer_name](dxf_path)
+    elapsed = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((analyzer_name, analysis, elapsed, baseline_rss, peak_rss))
+
+
+def main():
+    arg = sys.argv[1] if len(sys.argv) > 1 else "1000000"
+    with tempfile.TemporaryDirectory() as tmp:
+        if arg.lower().endswith(".dxf"):
+            dxf_path = arg
+        else:
+            dxf_path = str(Path(tmp) / "bench.dxf")
+            rng = np.random.default_rng(0)
+            write_points_dxf((rng.random((int(arg), 3)) * 100 - 50).astype(np.float32), dxf_path)
+        print(f"DXF: {dxf_path} ({Path(dxf_path).stat().st_size / 1024 / 1024:.1f} MB)")
+
+        queue = multiprocessing.Queue()
+        analyses = []
+        for analyzer_name in ('streaming scan', 'ezdxf readfile'):
+            proc = multiprocessing.Process(target=run, args=(analyzer_name, dxf_path, queue))
+            proc.start()
+            name, analysis, elapsed, baseline_rss, peak_rss = queue.get()
+            proc.join()
+            analyses.append(analysis)
+
+            print(f"\n=== {name} ===")
+            print(f"Points: {analysis['point_count']}")
+            print(f"Time: {elapsed:.2f}s")
+            # ru_maxrss is in KB on Linux
+            print(f"Peak RSS: {peak_rss / 1024:.1f} MB (+{(peak_rss - baseline_rss) / 1024:.1f} MB)")
+
+    assert analyses[0] == analyses[1], "Scanner and ezdxf disagree"
+    print("\nAnalyses match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark streaming DXF writer against the ezdxf document path
+
+Usage: python benchmarks/bench_dxf_writer.py [size]
+Each writer runs in its own process so peak RSS is measured independently.
+"""
+
+import sys
+import time
+import resource
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import ezdxf
+
+from pointcloud import extract_points
+from dxf_writer import write_points_dxf, DXF_LAYER
+
+MAX_DEPTH_MM = 50.0
+
+
+def synthetic_depth_map(size):
+    """Radial dome with a dark border so the background mask has work to do"""
+    yy, xx = np.mgrid[0:size, 0:size]
+    radius = np.hypot(xx - size / 2, yy - size / 2) / (size / 2)
+    return np.clip((1.0 - radius) * 255, 0, 255).astype(np.uint8)
+
+
+def write_document(points, dxf_path):
+    """Previous path: one ezdxf entity per point, then saveas"""
+    doc = ezdxf.new('R12')
+    msp = doc.modelspace()
+    doc.layers.new(name=DXF_LAYER)
+    dxfattribs = {'layer': DXF_LAYER}
+    for location in points.tolist():
+        msp.add_point(location, dxfattribs=dxfattribs)
+    doc.saveas(dxf_path)
+    return len(points)
+
+
+def run(writer_name, size, queue):
+    writers = {'ezdxf document': write_document, 'streaming': write_points_dxf}
+    depth = synthetic_depth_map(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        dxf_path = str(Path(tmp) / "bench.dxf")
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        start = time.perf_counter()
+        points = extract_points(depth, MAX_DEPTH_MM, background_threshold=10)
+        count = writers[writer_name](points, dxf_path)
+        elapsed = time.perf_counter() - start
+
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        file_size = Path(dxf_path).stat().st_size
+    queue.put((writer_name, count, elapsed, baseline_rss, peak_rss, file_size))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"Synthetic depth map: {size}x{size}")
+
+    queue = multiprocessing.Queue()
+    for writer_name in ('streaming', 'ezdxf document'):
+        proc = multiprocessing.Process(target=run, args=(writer_name, size, queue))
+        proc.start()
+        result = queue.get()
+        proc.join()
+
+        name, count, elapsed, baseline_rss, peak_rss, file_size = result
+        print(f"\n=== {name} ===")
+        print(f"Points: {count}")
+        print(f"Time: {elapsed:.2f}s")
+        # ru_maxrss is in KB on Linux
+        print(f"Peak RSS: {peak_rss / 1024:.1f} MB (+{(peak_rss - baseline_rss) / 1024:.1f} MB)")
+        print(f"DXF size: {file_size / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Event-loop latency during a login storm: inline bcrypt against the bounded pool
+
+Usage: python benchmarks/bench_login_storm.py [logins] [accounts] [ips]
+Fires every login at once, the way a shift start does, while a ticker
+coroutine measures how late the event loop wakes it every 10 ms. Inline
+verification is what /login did before; the pool run goes through the same
+login_slot and run_password_job calls as auth.authenticate_user.
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from fastapi import HTTPException
+
+from password_hashing import hash_password, check_password, run_password_job, login_slot, BCRYPT_ROUNDS
+
+TICK_SECONDS = 0.01
+PASSWORD = "correct horse battery staple"
+
+
+async def ticker(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def inline_login(password_hash, account, ip):
+    return check_password(PASSWORD, password_hash)
+
+
+async def pooled_login(password_hash, account, ip):
+    async with login_slot(account, ip):
+        return await run_password_job(check_password, PASSWORD, password_hash)
+
+
+async def storm(login, password_hash, logins, accounts, ips):
+    lags = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0.1)
+
+    outcomes = {}
+
+    async def attempt(index):
+        try:
+            await login(password_hash, f"user{index % accounts}@example.com", f"10.0.0.{index % ips}")
+            status = 200
+        except HTTPException as e:
+            status = e.status_code
+        outcomes[status] = outcomes.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(attempt(i) for i in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await tick_task
+    return elapsed, np.array(lags) * 1000, outcomes
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    accounts = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    ips = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    password_hash = hash_password(PASSWORD)
+    print(f"{logins} logins over {accounts} accounts and {ips} IPs, bcrypt cost {BCRYPT_ROUNDS}")
+
+    for name, login in (("inline bcrypt", inline_login), ("bcrypt pool", pooled_login)):
+        elapsed, lags, outcomes = asyncio.run(storm(login, password_hash, logins, accounts, ips))
+        print(f"\n=== {name} ===")
+        print(f"Storm time: {elapsed:.2f}s, outcomes: {dict(sorted(outcomes.items()))}")
+        print(f"Loop lag ms: p50 {np.percentile(lags, 50):.1f}, p99 {np.percentile(lags, 99):.1f}, "
+              f"max {lags.max():.1f} over {len(lags)} ticks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark fused LUT post-processing against the PIL ImageEnhance path
+
+Usage: python benchmarks/bench_post_processing.py [size] [repeats]
+Checks the output stays within 1 grey level of the previous implementation before timing.
+"""
+
+import sys
+import time
+import itertools
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import cv2
+from PIL import Image, ImageEnhance
+
+from main import apply_depth_parameters, DepthMapParams
+from depth_processing import background_pattern_mask
+
+
+def pil_depth_parameters(depth_array, params):
+    """Previous implementation: PIL round trip and a new array per stage"""
+    processed = depth_array.copy()
+    if params.blur_amount > 0:
+        kernel_size = max(3, int(params.blur_amount * 2) + 1)
+        processed = cv2.GaussianBlur(processed, (kernel_size, kernel_size), 0)
+    if params.contrast != 1.0 or params.brightness != 0:
+        pil_image = Image.fromarray(processed)
+        if params.contrast != 1.0:
+            pil_image = ImageEnhance.Contrast(pil_image).enhance(params.contrast)
+        if params.brightness != 0:
+            pil_image = ImageEnhance.Brightness(pil_image).enhance(1.0 + (params.brightness / 100.0))
+        processed = np.array(pil_image)
+    if params.edge_enhancement > 0:
+        edges = cv2.Canny(processed, 50, 150)
+        processed = cv2.addWeighted(processed, 1.0, edges, params.edge_enhancement * 0.3, 0)
+    if params.invert_depth:
+        processed = 255 - processed
+    if params.background_threshold > 0:
+        mask = processed <= params.background_threshold
+        processed[background_pattern_mask(mask)] = 0
+    return processed
+
+
+def synthetic_depth_map(size):
+    yy, xx = np.mgrid[0:size, 0:size]
+    dome = np.clip(255 - np.hypot(xx - size / 2, yy - size / 2) / size * 2 * 255, 0, 255)
+    ripple = 20 * np.sin(xx / 7.0) * np.cos(yy / 11.0)
+    return np.clip(dome + ripple, 0, 255).astype(np.uint8)
+
+
+def parameter_grid():
+    for blur, contrast, brightness, edges, invert, threshold in itertools.product(
+        (0, 2), (0.5, 1.0, 1.7), (-30, 0, 25), (0, 0.6), (False, True), (0, 10)
+    ):
+        yield DepthMapParams(
+            blur_amount=blur, contrast=contrast, brightness=brightness,
+            edge_enhancement=edges, invert_depth=invert, background_threshold=threshold
+        )
+
+
+def check_tolerance(depth):
+    worst = 0
+    for params in parameter_grid():
+        expected = pil_depth_parameters(depth, params).astype(np.int16)
+        actual = apply_depth_parameters(depth, params).astype(np.int16)
+        worst = max(worst, int(np.abs(expected - actual).max()))
+    print(f"Max difference from PIL path: {worst} grey levels")
+    return worst <= 1
+
+
+def measure(func, depth, params, repeats):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(depth, params)
+    elapsed = (time.perf_counter() - start) / repeats
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    if not check_tolerance(synthetic_depth_map(256)):
+        sys.exit(1)
+
+    depth = synthetic_depth_map(size)
+    params = DepthMapParams(blur_amount=2, contrast=1.4, brightness=10, edge_enhancement=0.5, invert_depth=True)
+    print(f"Depth map: {size}x{size}")
+    for name, func in (("PIL ImageEnhance", pil_depth_parameters), ("Fused LUT", apply_depth_parameters)):
+        elapsed, peak = measure(func, depth, params, repeats)
+        # tracemalloc sees NumPy buffers only; OpenCV and PIL allocate outside it
+        print(f"{name}: {elapsed * 1000:.1f} ms, peak traced NumPy memory {peak / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
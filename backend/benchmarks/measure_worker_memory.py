@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Measure per-worker memory for `uvicorn --workers` against the pre-fork server
+
+Usage: python benchmarks/measure_worker_memory.py [workers] [port]
+Starts each server mode in turn, waits for it to answer, then reads
+/proc/<pid>/smaps_rollup for every worker. USS (private pages) is what each
+extra worker really costs; PSS splits shared pages between the processes
+using them, so its total is the whole server's footprint. Linux only.
+"""
+
+import os
+import sys
+import time
+import signal
+import subprocess
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+READY_TIMEOUT_SECONDS = 600
+
+
+def children_of(pid):
+    """All descendant pids, via /proc/<pid>/task/*/children"""
+    found = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        for child in (task / "children").read_text().split():
+            found.append(int(child))
+            found.extend(children_of(int(child)))
+    return found
+
+
+def memory_kb(pid):
+    """Rss, Pss and USS (Private_Clean + Private_Dirty) in KB"""
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return fields["Rss"], fields["Pss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+
+def wait_ready(port, proc):
+    deadline = time.time() + READY_TIMEOUT_SECONDS
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with {proc.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=2)
+            return
+        except OSError:
+            time.sleep(1)
+    raise RuntimeError("Server did not become ready")
+
+
+def measure(name, command, workers, port):
+    env = dict(os.environ, API_HOST="127.0.0.1", API_PORT=str(port))
+    proc = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, start_new_session=True)
+    try:
+        wait_ready(port, proc)
+        # Give the remaining workers time to finish starting up
+        time.sleep(10)
+
+        rows = []
+        for pid in [proc.pid] + children_of(proc.pid):
+            cmdline = Path(f"/proc/{pid}/cmdline").read_text().replace("\0", " ").strip()
+            rows.append((pid, cmdline, *memory_kb(pid)))
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait()
+
+    print(f"\n=== {name} ({workers} workers) ===")
+    print(f"{'pid':>8} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8}  command")
+    for pid, cmdline, rss, pss, uss in rows:
+        print(f"{pid:>8} {rss / 1024:>8.1f} {pss / 1024:>8.1f} {uss / 1024:>8.1f}  {cmdline[:60]}")
+    print(f"{'total':>8} {sum(r[2] for r in rows) / 1024:>8.1f} "
+          f"{sum(r[3] for r in rows) / 1024:>8.1f} {sum(r[4] for r in rows) / 1024:>8.1f}")
+    return sum(r[3] for r in rows)
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+
+    before = measure("uvicorn --workers", [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)
+    ], workers, port)
+    after = measure("serve.py pre-fork", [
+        sys.executable, "serve.py", "--workers", str(workers)
+    ], workers, port)
+
+    print(f"\nTotal PSS: {before / 1024:.1f} MB -> {after / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
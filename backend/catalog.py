@@ -0,0 +1,184 @@
+"""
+File catalogue for Crystal Etching Converter
+Indexes static/ in the database so file listings page through rows instead of globbing
+"""
+import os
+import re
+import json
+import base64
+import binascii
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, Query
+
+from database import CatalogFile, CatalogGroup
+
+LISTED_SUFFIXES = {'.png', '.jpg', '.jpeg', '.dxf'}
+GROUP_UUID_PATTERN = re.compile(r'([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})')
+# Filename prefix -> CatalogGroup column holding that role
+GROUP_ROLES = (
+    ('original_', 'original_filename'),
+    ('depth_map_', 'depth_map_filename'),
+    ('output_', 'dxf_filename'),
+)
+
+
+def file_type(filename: str) -> Optional[str]:
+    """Listing type of a static file, or None for files the browser never shows"""
+    suffix = Path(filename).suffix
+    if suffix not in LISTED_SUFFIXES:
+        return None
+    if filename.startswith('original_'):
+        return 'original'
+    return 'depth_map' if suffix == '.png' else 'dxf'
+
+
+def _modified_at(stat: os.stat_result) -> datetime:
+    # Whole seconds: MySQL DATETIME drops the fraction, which would make every rescan see a change
+    return datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc).replace(tzinfo=None)
+
+
+def _new_row(filename: str) -> CatalogFile:
+    match = GROUP_UUID_PATTERN.search(filename)
+    return CatalogFile(
+        filename=filename,
+        group_uuid=match.group(1) if match else None,
+        file_type=file_type(filename)
+    )
+
+
+def refresh_groups(db: Session, uuids: Iterable[str]) -> None:
+    """Recompute group rows from their files' catalogue rows"""
+    for uuid in uuids:
+        files = db.query(CatalogFile).filter(CatalogFile.group_uuid == uuid).all()
+        group = db.query(CatalogGroup).filter(CatalogGroup.uuid == uuid).first()
+        if not files:
+            if group:
+                db.delete(group)
+            continue
+        if group is None:
+            group = CatalogGroup(uuid=uuid)
+            db.add(group)
+        group.total_size = sum(f.size for f in files)
+        group.modified_at = max(f.modified_at for f in files)
+        for prefix, column in GROUP_ROLES:
+            setattr(group, column, next((f.filename for f in files if f.filename.startswith(prefix)), None))
+
+
+def sync_files(db: Session, static_dir: Path, filenames: Iterable[str]) -> None:
+    """Bring the catalogue rows for these files in line with what is on disk"""
+    uuids: Set[str] = set()
+    # A batch can name the same file twice; with autoflush off the second
+    # lookup would miss the pending row and insert a duplicate
+    for filename in dict.fromkeys(filenames):
+        if file_type(filename) is None:
+            continue
+        row = db.query(CatalogFile).filter(CatalogFile.filename == filename).first()
+        path = static_dir / filename
+        if not path.exists():
+            if row:
+                uuids.add(row.group_uuid)
+                db.delete(row)
+            continue
+        if row is None:
+            row = _new_row(filename)
+            db.add(row)
+        stat = path.stat()
+        row.size = stat.st_size
+        row.modified_at = _modified_at(stat)
+        uuids.add(row.group_uuid)
+
+    db.flush()
+    refresh_groups(db, uuids - {None})
+    db.commit()
+
+
+def rescan_catalog(db: Session, static_dir: Path = Path("static")) -> Tuple[int, int, int]:
+    """Reconcile the whole catalogue with static/, returning (added, updated, removed)"""
+    on_disk = {}
+    with os.scandir(static_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and file_type(entry.name):
+                on_disk[entry.name] = entry.stat()
+
+    rows = {row.filename: row for row in db.query(CatalogFile)}
+    uuids: Set[str] = set()
+    added = updated = removed = 0
+
+    for filename, row in rows.items():
+        if filename not in on_disk:
+            uuids.add(row.group_uuid)
+            db.delete(row)
+            removed += 1
+
+    for filename, stat in on_disk.items():
+        row = rows.get(filename)
+        modified_at = _modified_at(stat)
+        if row is None:
+            row = _new_row(filename)
+            db.add(row)
+            added += 1
+        elif row.size == stat.st_size and row.modified_at == modified_at:
+            continue
+        else:
+            updated += 1
+        row.size = stat.st_size
+        row.modified_at = modified_at
+        uuids.add(row.group_uuid)
+
+    db.flush()
+    refresh_groups(db, uuids - {None})
+    db.commit()
+    return added, updated, removed
+
+
+def encode_cursor(value, row_id: int) -> str:
+    """Opaque keyset cursor: the last row's sort value and id"""
+    if isinstance(value, datetime):
+        payload = {"t": value.isoformat(), "id": row_id}
+    else:
+        payload = {"v": value, "id": row_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Inverse of encode_cursor; raises ValueError for anything malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = datetime.fromisoformat(payload["t"]) if "t" in payload else payload["v"]
+        return value, int(payload["id"])
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def page(query: Query, sort_column, id_column, descending: bool, limit: int,
+         cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """One keyset page ordered by (sort_column, id), plus the cursor for the next page
+
+    Rows may also be tuples whose first element is the entity being paged,
+    for queries that select extra columns alongside it.
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(sort_column < value, and_(sort_column == value, id_column < row_id)))
+        else:
+            query = query.filter(or_(sort_column > value, and_(sort_column == value, id_column > row_id)))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        if isinstance(last, Row):
+            last = last[0]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+    return rows[:limit], next_cursor
@@ -3,12 +3,14 @@ Database models and connection management for Crystal Etching Converter
 """
 import os
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, BigInteger, Index
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import QueuePool, StaticPool
 from dotenv import load_dotenv
-import bcrypt
+
+from password_hashing import hash_password, check_password
 
 # Load environment variables
 load_dotenv()
@@ -20,18 +22,64 @@ DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = os.getenv('DB_PORT', '3306')
 DB_NAME = os.getenv('DB_DATABASE', 'three-3d')
 
-# Create database URL
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Create database URL; DATABASE_URL overrides the DB_* settings, e.g. sqlite:///converter.db
+DATABASE_URL = os.getenv("DATABASE_URL") or f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Connection pool, per worker process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))  # Seconds, keeps connections under MySQL's wait_timeout
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a free connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))  # Wait for a writer instead of failing
+
+def _is_in_memory_sqlite(url) -> bool:
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each SQLite connection: WAL so readers never wait for the writer"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")  # Ignored (stays 'memory') for in-memory databases
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; fsyncs at checkpoints only
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def create_db_engine(database_url: str = DATABASE_URL) -> Engine:
+    """Engine for MySQL (or any server database) with a tunable pool, or for SQLite with WAL"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if _is_in_memory_sqlite(url):
+            # One shared connection, otherwise every connection would see its own empty database
+            sqlite_engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool, echo=False)
+        else:
+            sqlite_engine = create_engine(
+                url,
+                connect_args=connect_args,
+                poolclass=QueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                echo=False
+            )
+        event.listen(sqlite_engine, "connect", _sqlite_pragmas)
+        return sqlite_engine
+    
+    return create_engine(
+        url,
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=True,  # Verify connections before using
+        echo=False  # Set to True for SQL debugging
+    )
 
 # Create engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=False  # Set to True for SQL debugging
-)
+engine = create_db_engine()
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -56,13 +104,12 @@ class User(Base):
     projects = relationship("Project", back_populates="user", cascade="all, delete-orphan")
     
     def set_password(self, password: str):
-        """Hash and set password"""
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        """Hash and set password (blocking; request handlers go through password_hashing's pool)"""
+        self.password_hash = hash_password(password)
     
     def verify_password(self, password: str) -> bool:
-        """Verify password against hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        """Verify password against hash (blocking)"""
+        return check_password(password, self.password_hash)
 
 class Project(Base):
     __tablename__ = "projects"
@@ -86,6 +133,11 @@ class Project(Base):
     # Relationships
     user = relationship("User", back_populates="projects")
     files = relationship("ProjectFile", back_populates="project", cascade="all, delete-orphan")
+    
+    # Newest-first keyset pagination of one user's projects
+    __table_args__ = (
+        Index("ix_projects_user_created", "user_id", "created_at", "id"),
+    )
 
 class ProjectFile(Base):
     __tablename__ = "project_files"
@@ -101,6 +153,60 @@ class ProjectFile(Base):
     
     # Relationships
     project = relationship("Project", back_populates="files")
+    
+    __table_args__ = (
+        Index("ix_project_files_project_type", "project_id", "file_type"),
+    )
+
+class ConversionJob(Base):
+    __tablename__ = "conversion_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    uuid = Column(String(36), unique=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    state = Column(String(20), nullable=False, default="queued", index=True)  # 'queued', 'running', 'completed', 'failed'
+    stage = Column(String(20), nullable=False, default="upload")  # 'upload', 'inference', 'post_process', 'dxf_write'
+    parameters = Column(Text, nullable=False)  # JSON-encoded DepthMapParams
+    original_filename = Column(String(255), nullable=False)
+    project_name = Column(String(255))
+    project_description = Column(Text)
+    error = Column(Text)
+    worker_pid = Column(Integer)  # Process that claimed the job while it is running
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime)
+
+class CatalogFile(Base):
+    __tablename__ = "file_catalog"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255), unique=True, index=True, nullable=False)
+    group_uuid = Column(String(36), index=True)  # UUID in the filename, if any
+    file_type = Column(String(50), nullable=False)  # 'original', 'depth_map', 'dxf'
+    size = Column(BigInteger, nullable=False)
+    modified_at = Column(DateTime, nullable=False)  # File mtime, UTC
+    
+    # Keyset pagination for each sort order
+    __table_args__ = (
+        Index("ix_file_catalog_modified", "modified_at", "id"),
+        Index("ix_file_catalog_size", "size", "id"),
+    )
+
+class CatalogGroup(Base):
+    __tablename__ = "file_catalog_groups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    uuid = Column(String(36), unique=True, index=True, nullable=False)
+    original_filename = Column(String(255))
+    depth_map_filename = Column(String(255))
+    dxf_filename = Column(String(255))
+    total_size = Column(BigInteger, nullable=False, default=0)
+    modified_at = Column(DateTime, nullable=False)  # Newest file in the group, UTC
+    
+    __table_args__ = (
+        Index("ix_file_catalog_groups_modified", "modified_at", "id"),
+        Index("ix_file_catalog_groups_size", "total_size", "id"),
+    )
 
 # Dependency to get database session
 def get_db():
@@ -113,8 +219,9 @@ def get_db():
 
 # Create tables
 def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    """Create or upgrade the schema by applying migrations/ (models must match the migrated schema)"""
+    from migrate import upgrade
+    upgrade(engine)
 
 # Create admin user
 def create_admin_user(db: Session):
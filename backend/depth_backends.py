@@ -0,0 +1,121 @@
+"""
+Depth estimation backends for Crystal Etching Converter
+CPU inference through the transformers pipeline, int8-quantized torch or ONNX Runtime
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+import cv2
+from PIL import Image
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEPTH_BACKEND = os.getenv("DEPTH_BACKEND", "pipeline")  # 'pipeline', 'torch_int8' or 'onnx'
+DEPTH_MODEL = os.getenv("DEPTH_MODEL", "depth-anything/Depth-Anything-V2-Small-hf")
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", "models/depth_anything_v2_small.onnx")
+ONNX_NUM_THREADS = int(os.getenv("ONNX_NUM_THREADS", 0))  # 0 lets ONNX Runtime decide
+
+
+def normalize_depth(depth_array: np.ndarray) -> np.ndarray:
+    """Stretch relative depth to the full uint8 range"""
+    return ((depth_array - depth_array.min()) /
+            (depth_array.max() - depth_array.min()) * 255).astype(np.uint8)
+
+
+def resize_to_images(predicted: np.ndarray, images: List[Image.Image]) -> List[np.ndarray]:
+    """Bicubic-resize (B, h, w) model output back to each input image's size"""
+    return [
+        cv2.resize(depth.astype(np.float32), image.size, interpolation=cv2.INTER_CUBIC)
+        for depth, image in zip(predicted, images)
+    ]
+
+
+class DepthBackend(ABC):
+    """Common interface: relative depth at the input image's size"""
+    name = None
+
+    @abstractmethod
+    def estimate_depth_batch(self, images: List[Image.Image]) -> List[np.ndarray]:
+        """Relative depth for each image, resized to that image's own size"""
+
+    def estimate_depth(self, image: Image.Image) -> np.ndarray:
+        return self.estimate_depth_batch([image])[0]
+
+
+class PipelineBackend(DepthBackend):
+    """fp32 transformers depth-estimation pipeline"""
+    name = "pipeline"
+
+    def __init__(self, model_name: str = DEPTH_MODEL):
+        import torch
+        from transformers import pipeline
+        self.torch = torch
+        self.pipe = pipeline("depth-estimation", model=model_name, device="cpu")
+
+    def estimate_depth_batch(self, images: List[Image.Image]) -> List[np.ndarray]:
+        # Calling the pipeline itself is not thread-safe: its postprocess resizes
+        # to an image size kept on the shared instance, which concurrent calls
+        # and mixed-size batches overwrite. Run its processor and model directly.
+        inputs = self.pipe.image_processor(images=images, return_tensors="pt")
+        with self.torch.inference_mode():
+            predicted = self.pipe.model(**inputs).predicted_depth
+        return resize_to_images(predicted.numpy(), images)
+
+
+class QuantizedTorchBackend(DepthBackend):
+    """Same checkpoint with Linear layers dynamically quantized to int8 at load"""
+    name = "torch_int8"
+
+    def __init__(self, model_name: str = DEPTH_MODEL):
+        import torch
+        from transformers import AutoImageProcessor, AutoModelForDepthEstimation
+        self.torch = torch
+        self.processor = AutoImageProcessor.from_pretrained(model_name)
+        model = AutoModelForDepthEstimation.from_pretrained(model_name).eval()
+        self.model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def estimate_depth_batch(self, images: List[Image.Image]) -> List[np.ndarray]:
+        inputs = self.processor(images=images, return_tensors="pt")
+        with self.torch.inference_mode():
+            predicted = self.model(**inputs).predicted_depth
+        return resize_to_images(predicted.numpy(), images)
+
+
+class OnnxBackend(DepthBackend):
+    """ONNX Runtime session exported by export_depth_model.py"""
+    name = "onnx"
+
+    def __init__(self, model_path: str = ONNX_MODEL_PATH, model_name: str = DEPTH_MODEL):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("DEPTH_BACKEND=onnx requires onnxruntime (pip install onnxruntime)")
+        if not os.path.exists(model_path):
+            raise RuntimeError(f"ONNX model not found at {model_path}, run export_depth_model.py first")
+
+        from transformers import AutoImageProcessor
+        self.processor = AutoImageProcessor.from_pretrained(model_name)
+
+        options = ort.SessionOptions()
+        if ONNX_NUM_THREADS > 0:
+            options.intra_op_num_threads = ONNX_NUM_THREADS
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def estimate_depth_batch(self, images: List[Image.Image]) -> List[np.ndarray]:
+        inputs = self.processor(images=images, return_tensors="np")
+        predicted = self.session.run(None, {self.input_name: inputs["pixel_values"].astype(np.float32)})[0]
+        return resize_to_images(predicted, images)
+
+
+BACKENDS = {backend.name: backend for backend in (PipelineBackend, QuantizedTorchBackend, OnnxBackend)}
+
+
+def create_backend(name: str = DEPTH_BACKEND) -> DepthBackend:
+    """Instantiate a backend by its DEPTH_BACKEND name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DEPTH_BACKEND '{name}', expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -0,0 +1,107 @@
+"""
+Raw depth cache for Crystal Etching Converter
+Keeps normalized model output per image so parameter changes skip inference
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from shared_cache import SharedDiskCache, shared_cache
+
+load_dotenv()
+
+DEPTH_CACHE_MB = int(os.getenv("DEPTH_CACHE_MB", 256))
+DEPTH_CACHE_DIR = os.getenv("DEPTH_CACHE_DIR")  # Optional spill directory for evicted entries
+
+
+def file_content_hash(path: str) -> str:
+    """SHA-256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DepthCache:
+    """Size-bounded LRU of raw depth arrays keyed by image content hash"""
+
+    def __init__(self, max_bytes: int, spill_dir: Optional[str] = None, shared: Optional[SharedDiskCache] = None):
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _spill_path(self, key: str) -> Path:
+        return self.spill_dir / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached array, falling back to the shared tier and then the spill directory"""
+        with self._lock:
+            depth = self._entries.get(key)
+            if depth is not None:
+                self._entries.move_to_end(key)
+                return depth
+
+        if self.shared:
+            depth = self.shared.get_array("depth", key)
+            if depth is not None:
+                self._remember(key, depth)
+                return depth
+
+        if self.spill_dir:
+            spill_path = self._spill_path(key)
+            if spill_path.exists():
+                try:
+                    depth = np.load(spill_path)
+                except (OSError, ValueError):
+                    return None
+                self.put(key, depth)
+                return depth
+        return None
+
+    def put(self, key: str, depth: np.ndarray) -> None:
+        """Insert an array, evicting least recently used entries over budget"""
+        if self.shared:
+            self.shared.put_array("depth", key, depth)
+        self._remember(key, depth)
+
+    def _remember(self, key: str, depth: np.ndarray) -> None:
+        depth.setflags(write=False)
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = depth
+            self._bytes += depth.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old_depth = self._entries.popitem(last=False)
+                self._bytes -= old_depth.nbytes
+                evicted.append((old_key, old_depth))
+
+        if self.spill_dir:
+            for old_key, old_depth in evicted:
+                spill_path = self._spill_path(old_key)
+                if not spill_path.exists():
+                    # Write then rename so readers never see a partial file
+                    tmp_path = spill_path.with_suffix(f".{os.getpid()}.tmp")
+                    with open(tmp_path, 'wb') as f:
+                        np.save(f, old_depth)
+                    os.replace(tmp_path, spill_path)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+depth_cache = DepthCache(DEPTH_CACHE_MB * 1024 * 1024, DEPTH_CACHE_DIR, shared_cache)
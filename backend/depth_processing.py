@@ -0,0 +1,111 @@
+"""
+Depth map processing helpers for Crystal Etching Converter
+Whole-array operations for working-resolution inference and apply_depth_parameters
+"""
+from typing import Tuple
+
+import numpy as np
+import cv2
+
+PATTERN_TILE = 10  # Checkerboard tile pitch in pixels
+PATTERN_BLOCK = 5  # Marked block in the top-left corner of each tile
+MODEL_INPUT_SIZE = 518  # Depth Anything V2 processor target edge
+MODEL_INPUT_MULTIPLE = 14  # ViT patch size; the processor rounds each side to a multiple
+
+
+def background_pattern_mask(mask: np.ndarray) -> np.ndarray:
+    """Pixels to blank so excluded background shows as a checkerboard
+
+    A tile's top-left PATTERN_BLOCK square is blanked when any pixel inside
+    that square is background.
+    """
+    height, width = mask.shape
+    tiles_y = -(-height // PATTERN_TILE)
+    tiles_x = -(-width // PATTERN_TILE)
+
+    padded = np.zeros((tiles_y * PATTERN_TILE, tiles_x * PATTERN_TILE), dtype=bool)
+    padded[:height, :width] = mask
+    blocks = padded.reshape(tiles_y, PATTERN_TILE, tiles_x, PATTERN_TILE)[:, :PATTERN_BLOCK, :, :PATTERN_BLOCK]
+    marked = blocks.any(axis=(1, 3))
+
+    pattern = np.zeros((tiles_y, PATTERN_TILE, tiles_x, PATTERN_TILE), dtype=bool)
+    pattern[:, :PATTERN_BLOCK, :, :PATTERN_BLOCK] = marked[:, None, :, None]
+    return pattern.reshape(tiles_y * PATTERN_TILE, tiles_x * PATTERN_TILE)[:height, :width]
+
+
+def _blend(degenerate: float, values: np.ndarray, factor: float) -> np.ndarray:
+    """PIL Image.blend on a value ramp: float32 interpolation, clipped and truncated"""
+    degenerate = np.float32(degenerate)
+    blended = degenerate + np.float32(factor) * (values - degenerate)
+    return np.floor(np.clip(blended, 0, 255))
+
+
+def tone_lut(contrast: float, brightness: int, mean: int, invert: bool = False) -> np.ndarray:
+    """256-entry uint8 lookup table composing contrast, brightness and inversion
+
+    Matches PIL ImageEnhance: contrast blends with a flat image at the rounded
+    mean grey level, brightness blends with black.
+    """
+    values = np.arange(256, dtype=np.float32)
+    if contrast != 1.0:
+        values = _blend(mean, values, contrast)
+    if brightness != 0:
+        values = _blend(0, values, 1.0 + brightness / 100.0)
+
+    lut = values.astype(np.uint8)
+    if invert:
+        lut = 255 - lut
+    return lut
+
+
+def working_size(size: Tuple[int, int], max_edge: int) -> Tuple[int, int]:
+    """Scale (width, height) down so the long edge fits max_edge (0 disables the cap)"""
+    width, height = size
+    long_edge = max(width, height)
+    if max_edge <= 0 or long_edge <= max_edge:
+        return size
+    scale = max_edge / long_edge
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def model_input_size(size: Tuple[int, int]) -> Tuple[int, int]:
+    """(width, height) the Depth Anything processor resizes an image to
+
+    Mirrors DPTImageProcessor with keep_aspect_ratio and ensure_multiple_of:
+    one scale for both sides, whichever of the two that brings a side to 518
+    changes the image least, then each side rounded to a multiple of 14.
+    """
+    width, height = size
+    scale_width = MODEL_INPUT_SIZE / width
+    scale_height = MODEL_INPUT_SIZE / height
+    scale = scale_width if abs(1 - scale_width) < abs(1 - scale_height) else scale_height
+    return tuple(
+        int(round(side * scale / MODEL_INPUT_MULTIPLE) * MODEL_INPUT_MULTIPLE) for side in (width, height)
+    )
+
+
+def guided_upsample(depth: np.ndarray, guide: np.ndarray, radius: int, eps: float) -> np.ndarray:
+    """Upsample low-resolution depth to the guide's size with a fast guided filter
+
+    The local linear model (He et al.) is fitted at depth resolution against a
+    downscaled guide, then its coefficients are upsampled and applied to the
+    full-resolution guide so photo silhouettes carry into the depth edges.
+    """
+    height, width = guide.shape
+    low_height, low_width = depth.shape
+    ksize = (2 * radius + 1, 2 * radius + 1)
+
+    guide_full = guide.astype(np.float32) / 255.0
+    guide_low = cv2.resize(guide_full, (low_width, low_height), interpolation=cv2.INTER_AREA)
+    depth = depth.astype(np.float32)
+
+    mean_guide = cv2.boxFilter(guide_low, -1, ksize)
+    mean_depth = cv2.boxFilter(depth, -1, ksize)
+    cov = cv2.boxFilter(guide_low * depth, -1, ksize) - mean_guide * mean_depth
+    var = cv2.boxFilter(guide_low * guide_low, -1, ksize) - mean_guide * mean_guide
+
+    a = cov / (var + eps)
+    b = mean_depth - a * mean_guide
+    mean_a = cv2.resize(cv2.boxFilter(a, -1, ksize), (width, height), interpolation=cv2.INTER_LINEAR)
+    mean_b = cv2.resize(cv2.boxFilter(b, -1, ksize), (width, height), interpolation=cv2.INTER_LINEAR)
+    return mean_a * guide_full + mean_b
@@ -0,0 +1,207 @@
+"""
+Streaming DXF analysis for Crystal Etching Converter
+Scans ASCII DXF group codes in buffered chunks to summarise point clouds without building entities
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SCAN_CHUNK_BYTES = 4 << 20
+# Entities that belong to a parent rather than standing alone in modelspace
+SUB_ENTITIES = {b'VERTEX', b'SEQEND', b'ATTRIB'}
+BINARY_DXF_SENTINEL = b'AutoCAD Binary DXF'
+
+
+class DXFScanError(ValueError):
+    """File layout the tag scanner does not handle; use the full ezdxf parser instead"""
+
+
+def _decode(value: bytes) -> str:
+    value = value.strip()
+    try:
+        return value.decode('utf-8')
+    except UnicodeDecodeError:
+        return value.decode('cp1252', errors='replace')
+
+
+def _tag_chunks(path: str, chunk_size: int):
+    """Yield (codes, values) arrays that always end on an entity boundary"""
+    carry: List[bytes] = []  # Lines of an entity that continues in the next chunk
+    partial = b''            # Line cut in half by the read boundary
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(chunk_size)
+            lines = (partial + block).split(b'\n')
+            partial = lines.pop() if block else b''
+            lines = carry + lines
+            pair_count = len(lines) // 2
+            if pair_count == 0:
+                if not block:
+                    return
+                carry = lines
+                continue
+
+            try:
+                codes = np.array(lines[0:2 * pair_count:2]).astype(np.int32)
+            except ValueError:
+                raise DXFScanError("Malformed group code")
+            values = np.array(lines[1:2 * pair_count:2])
+
+            if not block:
+                yield codes, values
+                return
+
+            # Hold back the last entity, it may not be complete yet
+            starts = np.flatnonzero(codes == 0)
+            cut = int(starts[-1]) if len(starts) else 0
+            if cut == 0:
+                carry = lines
+                continue
+            carry = lines[2 * cut:]
+            yield codes[:cut], values[:cut]
+
+
+def scan_dxf(path: str, chunk_size: int = SCAN_CHUNK_BYTES) -> Dict:
+    """Point count, bounds, version and layer/entity histograms from a tag-level scan
+
+    Only top-level modelspace entities in the ENTITIES section are counted,
+    matching what ezdxf's modelspace iteration would see.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(BINARY_DXF_SENTINEL)) == BINARY_DXF_SENTINEL:
+            raise DXFScanError("Binary DXF")
+
+    section: Optional[bytes] = None
+    seen_entities = False
+    dxf_version = None
+    point_count = 0
+    mins = np.full(3, np.inf)
+    maxs = np.full(3, -np.inf)
+    entity_types: Counter = Counter()
+    layers: Counter = Counter()
+
+    for codes, values in _tag_chunks(path, chunk_size):
+        starts = np.flatnonzero(codes == 0)
+        if len(starts) == 0:
+            continue
+        # Pairs before the first entity start (leading comments) map to -1
+        entity_of_pair = np.cumsum(codes == 0) - 1
+
+        type_names, entity_type = np.unique(values[starts], return_inverse=True)
+        type_names = [name.strip() for name in type_names]
+
+        # Sections only change at a handful of SECTION/ENDSEC markers
+        in_entities = np.zeros(len(starts), dtype=bool)
+        markers = [i for i, name in enumerate(type_names) if name in (b'SECTION', b'ENDSEC')]
+        position = 0
+        for entity in np.flatnonzero(np.isin(entity_type, markers)):
+            in_entities[position:entity] = section == b'ENTITIES'
+            if type_names[entity_type[entity]] == b'SECTION':
+                name_pair = starts[entity] + 1
+                section = values[name_pair].strip() if name_pair < len(codes) and codes[name_pair] == 2 else None
+                seen_entities |= section == b'ENTITIES'
+            else:
+                section = None
+            position = entity + 1
+        in_entities[position:] = section == b'ENTITIES'
+
+        if dxf_version is None:
+            for pair in np.flatnonzero(codes == 9):
+                if values[pair].strip() == b'$ACADVER' and pair + 1 < len(codes) and codes[pair + 1] == 1:
+                    dxf_version = _decode(values[pair + 1])
+
+        # Top-level modelspace entities only
+        counted = in_entities & ~np.isin(entity_type, [
+            i for i, name in enumerate(type_names) if name in SUB_ENTITIES or name in (b'SECTION', b'ENDSEC')
+        ])
+        for pair in np.flatnonzero((codes == 67) & (entity_of_pair >= 0)):
+            if values[pair].strip() == b'1':
+                counted[entity_of_pair[pair]] = False
+        if not counted.any():
+            continue
+
+        type_ids, type_counts = np.unique(entity_type[counted], return_counts=True)
+        for type_id, count in zip(type_ids, type_counts):
+            entity_types[_decode(type_names[type_id])] += int(count)
+
+        pair_counted = counted[entity_of_pair] & (entity_of_pair >= 0)
+        layer_pairs = np.flatnonzero((codes == 8) & pair_counted)
+        layer_names, layer_counts = np.unique(values[layer_pairs], return_counts=True)
+        for name, count in zip(layer_names, layer_counts):
+            layers[_decode(name)] += int(count)
+        unlayered = int(counted.sum()) - len(np.unique(entity_of_pair[layer_pairs]))
+        if unlayered:
+            layers['0'] += unlayered
+
+        point_ids = [i for i, name in enumerate(type_names) if name == b'POINT']
+        point_entities = counted & np.isin(entity_type, point_ids)
+        if not point_entities.any():
+            continue
+        pair_is_point = point_entities[entity_of_pair] & (entity_of_pair >= 0)
+        expected = np.flatnonzero(point_entities)
+        coords = []
+        for code in (10, 20, 30):
+            pairs = np.flatnonzero((codes == code) & pair_is_point)
+            # Exactly one of each coordinate per POINT, otherwise let ezdxf sort it out
+            if not np.array_equal(entity_of_pair[pairs], expected):
+                raise DXFScanError("POINT without a complete 10/20/30 location")
+            try:
+                coords.append(values[pairs].astype(np.float64))
+            except ValueError:
+                raise DXFScanError("Malformed POINT coordinate")
+
+        chunk_points = np.stack(coords, axis=1)
+        point_count += len(chunk_points)
+        mins = np.minimum(mins, chunk_points.min(axis=0))
+        maxs = np.maximum(maxs, chunk_points.max(axis=0))
+
+    if not seen_entities:
+        raise DXFScanError("No ENTITIES section")
+
+    return _analysis(point_count, mins, maxs, dxf_version or 'AC1009', entity_types, layers)
+
+
+def _analysis(point_count: int, mins, maxs, dxf_version: str, entity_types: Counter, layers: Counter) -> Dict:
+    bounds = None
+    if point_count:
+        bounds = {
+            axis: {"min": float(mins[i]), "max": float(maxs[i]), "range": float(maxs[i] - mins[i])}
+            for i, axis in enumerate("xyz")
+        }
+    return {
+        "point_count": point_count,
+        "bounds": bounds,
+        "dxf_version": dxf_version,
+        "entity_types": dict(entity_types.most_common()),
+        "layers": dict(layers.most_common()),
+    }
+
+
+def analyze_with_ezdxf(path: str) -> Dict:
+    """Same analysis through ezdxf's full parser, for files the scanner rejects"""
+    import ezdxf
+
+    doc = ezdxf.readfile(path)
+    entity_types: Counter = Counter()
+    layers: Counter = Counter()
+    locations = []
+    for entity in doc.modelspace():
+        entity_types[entity.dxftype()] += 1
+        layers[entity.dxf.layer] += 1
+        if entity.dxftype() == 'POINT':
+            locations.append(tuple(entity.dxf.location))
+
+    points = np.array(locations, dtype=np.float64).reshape(-1, 3)
+    mins = points.min(axis=0) if len(points) else None
+    maxs = points.max(axis=0) if len(points) else None
+    return _analysis(len(points), mins, maxs, doc.dxfversion, entity_types, layers)
+
+
+def analyze_dxf(path: str) -> Tuple[Dict, str]:
+    """Analyze with the streaming scanner, falling back to ezdxf; returns (analysis, method)"""
+    try:
+        return scan_dxf(path), "scan"
+    except DXFScanError as e:
+        print(f"DXF scan fell back to ezdxf: {e}")
+        return analyze_with_ezdxf(path), "ezdxf"
@@ -0,0 +1,60 @@
+"""
+Streaming DXF writer for Crystal Etching Converter
+Writes POINT clouds to R12 DXF without building an ezdxf entity per point
+"""
+import io
+
+import numpy as np
+import ezdxf
+
+DXF_LAYER = 'Venus3D'
+CHUNK_SIZE = 65536  # Points formatted and written per batch
+COORD_DECIMALS = 4  # 0.1 micron, well below float32 noise at crystal sizes
+
+_POINT_TEMPLATE = "  0\nPOINT\n  5\n%X\n  8\n{layer}\n 10\n%r\n 20\n%r\n 30\n%r\n"
+_FOOTER = "  0\nENDSEC\n  0\nEOF\n"
+
+
+def _render_preamble(point_count: int, layer: str):
+    """Render the HEADER/TABLES/BLOCKS sections ezdxf writes for an R12 document
+
+    Returns the text up to and including the ENTITIES section header and the
+    first entity handle, with $HANDSEED already accounting for point_count.
+    """
+    doc = ezdxf.new('R12')
+    doc.layers.new(name=layer)
+
+    handles = doc.entitydb.handles
+    first_handle = int(str(handles), 16)
+    handles.reset("%X" % (first_handle + point_count))
+
+    stream = io.StringIO()
+    doc.write(stream)
+    text = stream.getvalue()
+    marker = "  2\nENTITIES\n"
+    return text[:text.index(marker) + len(marker)], first_handle
+
+
+def write_points_dxf(points: np.ndarray, dxf_path: str, layer: str = DXF_LAYER,
+                     chunk_size: int = CHUNK_SIZE) -> int:
+    """Stream an (N, 3) coordinate array to an R12 DXF as POINT entities
+
+    Output matches the ezdxf document path (same header, layer table, handles
+    and group code layout) while memory stays bounded by chunk_size.
+    """
+    point_count = len(points)
+    preamble, handle = _render_preamble(point_count, layer)
+    template = _POINT_TEMPLATE.format(layer=layer)
+
+    with open(dxf_path, 'w', encoding='cp1252', newline='\n') as f:
+        f.write(preamble)
+        for start in range(0, point_count, chunk_size):
+            chunk = np.round(points[start:start + chunk_size].astype(np.float64), COORD_DECIMALS)
+            f.write("".join(
+                template % (handle + i, x, y, z)
+                for i, (x, y, z) in enumerate(chunk.tolist())
+            ))
+            handle += len(chunk)
+        f.write(_FOOTER)
+
+    return point_count
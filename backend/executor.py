@@ -0,0 +1,70 @@
+"""
+Worker pool for Crystal Etching Converter
+Runs CPU-bound stages (inference, DXF generation, DXF parsing) off the event loop
+"""
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", 2))
+CONVERSION_QUEUE_LIMIT = int(os.getenv("CONVERSION_QUEUE_LIMIT", 4))  # Waiting jobs beyond busy workers
+BUSY_RETRY_AFTER_SECONDS = int(os.getenv("BUSY_RETRY_AFTER_SECONDS", 10))
+
+
+class BoundedExecutor:
+    """Thread pool that answers 503 with Retry-After once its workers and wait queue are full"""
+
+    def __init__(self, workers: int, queue_limit: int, thread_name_prefix: str, busy_detail: str, retry_after: int):
+        self.limit = workers + queue_limit
+        self.busy_detail = busy_detail
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def check_capacity(self) -> None:
+        """Raise 503 when the pool and its queue are full"""
+        if self._pending >= self.limit:
+            raise HTTPException(
+                status_code=503,
+                detail=self.busy_detail,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+    def _release(self, _future) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking function on the pool and await its result"""
+        with self._pending_lock:
+            self.check_capacity()
+            self._pending += 1
+        future = self._executor.submit(func, *args, **kwargs)
+        # Released when the work finishes, even if the awaiting request is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+
+# Threads rather than processes: torch and OpenCV release the GIL in their
+# kernels, and every worker shares the single loaded model
+conversion_pool = BoundedExecutor(
+    CONVERSION_WORKERS, CONVERSION_QUEUE_LIMIT, "conversion",
+    "Server is busy processing other images, please retry shortly", BUSY_RETRY_AFTER_SECONDS
+)
+
+
+def check_capacity() -> None:
+    """Raise 503 with Retry-After when the conversion pool and its queue are full"""
+    conversion_pool.check_capacity()
+
+
+async def run_in_worker(func, *args, **kwargs):
+    """Run a blocking function on the conversion pool and await its result"""
+    return await conversion_pool.run(func, *args, **kwargs)
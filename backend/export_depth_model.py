@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Export Depth Anything V2 to ONNX and quantize it for the onnx backend
+
+Usage:
+  python export_depth_model.py export [output.onnx]
+  python export_depth_model.py quantize [input.onnx] [output.onnx]
+
+The torch_int8 backend needs no export: it quantizes the checkpoint when it loads.
+"""
+
+import sys
+from pathlib import Path
+
+from depth_backends import DEPTH_MODEL, ONNX_MODEL_PATH
+
+ONNX_OPSET = 17
+EXPORT_SIZE = 518  # Model's native input size; height and width stay dynamic
+
+
+def export_onnx(output_path):
+    """Export the fp32 checkpoint with dynamic batch, height and width"""
+    import torch
+    from transformers import AutoModelForDepthEstimation
+
+    class PredictedDepth(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, pixel_values):
+            return self.model(pixel_values=pixel_values).predicted_depth
+
+    model = AutoModelForDepthEstimation.from_pretrained(DEPTH_MODEL).eval()
+    dummy = torch.randn(1, 3, EXPORT_SIZE, EXPORT_SIZE)
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        PredictedDepth(model),
+        dummy,
+        output_path,
+        input_names=["pixel_values"],
+        output_names=["predicted_depth"],
+        dynamic_axes={
+            "pixel_values": {0: "batch", 2: "height", 3: "width"},
+            "predicted_depth": {0: "batch", 1: "height", 2: "width"},
+        },
+        opset_version=ONNX_OPSET,
+    )
+    print(f"Exported {DEPTH_MODEL} to {output_path}")
+
+
+def quantize_onnx(input_path, output_path):
+    """Dynamically quantize ONNX weights to int8"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantize_dynamic(input_path, output_path, weight_type=QuantType.QInt8)
+    print(f"Quantized {input_path} to {output_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("export", "quantize"):
+        print(__doc__)
+        sys.exit(1)
+
+    try:
+        if sys.argv[1] == "export":
+            export_onnx(sys.argv[2] if len(sys.argv) > 2 else ONNX_MODEL_PATH)
+        else:
+            input_path = sys.argv[2] if len(sys.argv) > 2 else ONNX_MODEL_PATH
+            default_output = str(Path(input_path).with_name(Path(input_path).stem + "_int8.onnx"))
+            quantize_onnx(input_path, sys.argv[3] if len(sys.argv) > 3 else default_output)
+    except Exception as e:
+        print(f"Export failed: {e}")
+        sys.exit(1)
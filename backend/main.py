@@ -7,32 +7,48 @@ import os
 import uuid
 from pathlib import Path
 from typing import Optional
-import tempfile
-import shutil
 import time
 import hashlib
+import re
+import threading
+import json
+import asyncio
+import weakref
+from collections import defaultdict
+from contextlib import AsyncExitStack
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, status, Form
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, status, Form, Request, Query
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Dict
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 
 import numpy as np
-from PIL import Image, ImageFilter, ImageEnhance
+from PIL import Image, ImageFilter
 import cv2
 import torch
-from transformers import pipeline
-import ezdxf
-from ezdxf.addons import r12writer
+
+from pointcloud import extract_points, save_lod_pyramid, lod_path, meta_path, load_point_meta, decimate_points, LOD_CELL_PIXELS
+from depth_processing import background_pattern_mask, tone_lut, working_size, model_input_size, guided_upsample
+from dxf_scan import analyze_dxf
+from dxf_writer import write_points_dxf
+from depth_cache import depth_cache, file_content_hash
+from preview_cache import preview_cache
+from depth_backends import create_backend, normalize_depth, DEPTH_BACKEND, DEPTH_MODEL, ONNX_MODEL_PATH
+from catalog import sync_files, rescan_catalog, page
+from artifact_store import conversion_id, new_upload_path, store_original, prune_original
+from tiled_depth import estimate_tiled_depth
+from executor import run_in_worker, check_capacity, BUSY_RETRY_AFTER_SECONDS
 
 # Import auth and database modules
-from database import get_db, init_db, create_admin_user, SessionLocal, User, Project, ProjectFile
+from database import get_db, init_db, create_admin_user, SessionLocal, User, Project, ProjectFile, ConversionJob, CatalogFile, CatalogGroup
 from auth import (
     create_access_token, 
     get_current_active_user,
@@ -40,6 +56,8 @@ from auth import (
     get_current_admin_user,
     authenticate_user,
     create_user,
+    token_claims,
+    user_cache,
     Token,
     UserCreate,
     UserResponse,
@@ -50,8 +68,18 @@ from auth import (
 load_dotenv()
 
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE_MB", 5)) * 1024 * 1024
+MAX_DXF_FILE_SIZE = int(os.getenv("MAX_DXF_FILE_SIZE_MB", os.getenv("MAX_FILE_SIZE_MB", 5))) * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 MAX_DEPTH_MM = float(os.getenv("MAX_DEPTH_MM", 50))
 PIXEL_SAMPLING_RATE = int(os.getenv("PIXEL_SAMPLING_RATE", 2))
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", 0))  # 0 keeps torch's default
+JOB_POLL_SECONDS = int(os.getenv("JOB_POLL_SECONDS", 5))
+INFERENCE_BATCH_SIZE = int(os.getenv("INFERENCE_BATCH_SIZE", 4))
+MAX_BATCH_IMAGES = int(os.getenv("MAX_BATCH_IMAGES", 50))
+INFERENCE_MAX_EDGE = int(os.getenv("INFERENCE_MAX_EDGE", 0))  # Long-edge cap for model input, 0 disables
+UPSAMPLE_RADIUS = int(os.getenv("UPSAMPLE_RADIUS", 4))  # Guided filter window at working resolution
+UPSAMPLE_EPS = float(os.getenv("UPSAMPLE_EPS", 1e-3))  # Guided filter edge smoothing
+CATALOG_RESCAN_SECONDS = int(os.getenv("CATALOG_RESCAN_SECONDS", 300))  # File catalogue reconciliation interval
 
 app = FastAPI(title="Crystal Etching Converter")
 
@@ -68,8 +96,20 @@ STATIC_DIR.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 depth_estimator = None
-preview_cache = {}  # Simple in-memory cache
-CACHE_EXPIRY = 60  # 60 seconds
+depth_estimator_lock = threading.Lock()
+# serve.py requeues once in the pre-fork parent and turns this off for its workers
+requeue_jobs_on_startup = True
+PREVIEW_MEDIA_TYPES = {"png": "image/png", "webp": "image/webp"}
+
+# Held while a conversion id is checked and, if needed, produced
+conversion_locks = weakref.WeakValueDictionary()
+
+UUID_PATTERN = r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}'
+
+JOB_STAGES = ["upload", "inference", "post_process", "dxf_write"]
+job_wakeup = asyncio.Event()  # Set when a job is queued so the dispatcher starts at once
+job_dispatcher_task = None
+catalog_rescan_task = None
 
 class DepthMapParams(BaseModel):
     blur_amount: float = Field(default=0, ge=0, le=10, description="Gaussian blur amount")
@@ -78,6 +118,34 @@ class DepthMapParams(BaseModel):
     edge_enhancement: float = Field(default=0, ge=0, le=1, description="Edge enhancement strength")
     invert_depth: bool = Field(default=False, description="Invert depth values")
     background_threshold: int = Field(default=10, ge=0, le=255, description="Threshold to remove background (0-255)")
+    tile_size: int = Field(default=0, ge=0, le=4096, description="Tile size for high-resolution tiled inference (0 = single pass)")
+    tile_overlap: int = Field(default=64, ge=0, le=1024, description="Overlap between inference tiles in pixels")
+
+def depth_params_form(
+    blur_amount: float = Form(0),
+    contrast: float = Form(1.0),
+    brightness: int = Form(0),
+    edge_enhancement: float = Form(0),
+    invert_depth: bool = Form(False),
+    background_threshold: int = Form(10),
+    tile_size: int = Form(0),
+    tile_overlap: int = Form(64)
+) -> DepthMapParams:
+    """DepthMapParams from multipart form fields, for endpoints that also take uploads"""
+    try:
+        return DepthMapParams(
+            blur_amount=blur_amount,
+            contrast=contrast,
+            brightness=brightness,
+            edge_enhancement=edge_enhancement,
+            invert_depth=invert_depth,
+            background_threshold=background_threshold,
+            tile_size=tile_size,
+            tile_overlap=tile_overlap
+        )
+    except ValidationError as e:
+        # Out-of-range fields get the same 422 as any other invalid form input
+        raise RequestValidationError(e.errors())
 
 class ProcessingRequest(BaseModel):
     parameters: DepthMapParams = Field(default_factory=DepthMapParams)
@@ -89,6 +157,30 @@ class ProcessingResponse(BaseModel):
     message: str
     parameters_used: Dict
 
+class BatchProcessingResponse(BaseModel):
+    results: List[ProcessingResponse]
+    message: str
+    parameters_used: Dict
+    elapsed_seconds: float
+    images_per_second: float
+
+class JobCreatedResponse(BaseModel):
+    job_id: str
+    state: str
+    status_url: str
+    result_url: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    state: str  # 'queued', 'running', 'completed' or 'failed'
+    stage: str
+    progress: int  # Percentage of stages completed
+    stages: Dict[str, str]  # Stage name -> 'pending', 'running', 'completed' or 'failed'
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
 class FileInfo(BaseModel):
     filename: str
     timestamp: datetime
@@ -98,7 +190,8 @@ class FileInfo(BaseModel):
 
 class FilesListResponse(BaseModel):
     files: List[FileInfo]
-    total_count: int
+    total_count: Optional[int]  # First page only
+    next_cursor: Optional[str] = None
 
 class GroupedFile(BaseModel):
     uuid: str
@@ -110,7 +203,8 @@ class GroupedFile(BaseModel):
 
 class GroupedFilesResponse(BaseModel):
     groups: List[GroupedFile]
-    total_groups: int
+    total_groups: Optional[int]  # First page only
+    next_cursor: Optional[str] = None
 
 # Project models
 class ProjectCreate(BaseModel):
@@ -126,6 +220,18 @@ class ProjectUpdate(BaseModel):
     edge_enhancement: Optional[float] = None
     invert_depth: Optional[bool] = None
 
+class ProjectFileResponse(BaseModel):
+    id: int
+    file_type: str
+    filename: str
+    file_path: str
+    file_size: Optional[int]
+    mime_type: Optional[str]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 class ProjectResponse(BaseModel):
     id: int
     uuid: str
@@ -138,24 +244,24 @@ class ProjectResponse(BaseModel):
     invert_depth: bool
     created_at: datetime
     updated_at: datetime
+    files: List[ProjectFileResponse] = []
     
     class Config:
         from_attributes = True
 
 class ProjectListResponse(BaseModel):
     projects: List[ProjectResponse]
-    total: int
+    total: Optional[int]  # First page only
+    next_cursor: Optional[str] = None
 
 def get_depth_estimator():
     global depth_estimator
-    if depth_estimator is None:
-        print("Loading depth estimation model (CPU-only)...")
-        depth_estimator = pipeline(
-            "depth-estimation",
-            model="depth-anything/Depth-Anything-V2-Small-hf",
-            device="cpu"
-        )
-        print("Model loaded successfully")
+    # Worker threads may race to load the model if startup pre-loading failed
+    with depth_estimator_lock:
+        if depth_estimator is None:
+            print(f"Loading depth estimation model (CPU-only, {DEPTH_BACKEND} backend)...")
+            depth_estimator = create_backend(DEPTH_BACKEND)
+            print("Model loaded successfully")
     return depth_estimator
 
 def validate_image_file(file: UploadFile) -> None:
@@ -169,32 +275,47 @@ def validate_image_file(file: UploadFile) -> None:
     if file.size and file.size > MAX_FILE_SIZE:
         raise HTTPException(400, f"File size must be less than {MAX_FILE_SIZE // 1024 // 1024}MB")
 
+async def save_upload(upload: UploadFile, dest: Path, max_bytes: int) -> str:
+    """Stream an upload to dest in chunks and return its SHA-256
+    
+    The size limit is enforced as bytes arrive, so an oversized upload is
+    rejected without ever being held in memory, and nothing is left at dest.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    partial_path = dest.with_name(dest.name + ".part")
+    try:
+        with open(partial_path, "wb") as f:
+            while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(400, f"File size must be less than {max_bytes // 1024 // 1024}MB")
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(partial_path, dest)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    return digest.hexdigest()
+
 def apply_depth_parameters(depth_array: np.ndarray, params: DepthMapParams) -> np.ndarray:
     """Apply processing parameters to depth map"""
+    # The only full-size copy; every stage below writes into this buffer
     processed = depth_array.copy()
     
     # Apply blur for noise reduction
     if params.blur_amount > 0:
         kernel_size = max(3, int(params.blur_amount * 2) + 1)  # Minimum kernel size of 3
-        processed = cv2.GaussianBlur(processed, (kernel_size, kernel_size), 0)
+        cv2.GaussianBlur(processed, (kernel_size, kernel_size), 0, dst=processed)
     
-    # Apply contrast and brightness adjustments
-    if params.contrast != 1.0 or params.brightness != 0:
-        # Convert to PIL for easier manipulation
-        pil_image = Image.fromarray(processed)
-        
-        # Apply contrast
-        if params.contrast != 1.0:
-            enhancer = ImageEnhance.Contrast(pil_image)
-            pil_image = enhancer.enhance(params.contrast)
-        
-        # Apply brightness
-        if params.brightness != 0:
-            enhancer = ImageEnhance.Brightness(pil_image)
-            brightness_factor = 1.0 + (params.brightness / 100.0)
-            pil_image = enhancer.enhance(brightness_factor)
-        
-        processed = np.array(pil_image)
+    # Contrast, brightness and inversion are pointwise, so they collapse into one LUT.
+    # Inversion has to wait until after edge enhancement when that is enabled.
+    invert_in_lut = params.invert_depth and params.edge_enhancement <= 0
+    if params.contrast != 1.0 or params.brightness != 0 or invert_in_lut:
+        # Contrast pivots on the mean grey level, as PIL ImageEnhance does
+        mean = int(cv2.mean(processed)[0] + 0.5)
+        lut = tone_lut(params.contrast, params.brightness, mean, invert_in_lut)
+        cv2.LUT(processed, lut, dst=processed)
     
     # Edge enhancement
     if params.edge_enhancement > 0:
@@ -202,46 +323,119 @@ def apply_depth_parameters(depth_array: np.ndarray, params: DepthMapParams) -> n
         edges = cv2.Canny(processed, 50, 150)
         # Blend edges with original
         edge_weight = params.edge_enhancement * 0.3
-        processed = cv2.addWeighted(processed, 1.0, edges, edge_weight, 0)
-    
-    # Invert depth if requested
-    if params.invert_depth:
-        processed = 255 - processed
+        cv2.addWeighted(processed, 1.0, edges, edge_weight, 0, dst=processed)
+        
+        # Invert depth if requested
+        if params.invert_depth:
+            cv2.bitwise_not(processed, dst=processed)
     
     # Apply background threshold visualization
     # Show areas that will be excluded with a pattern
     if params.background_threshold > 0:
-        # Create a copy for visualization
-        vis_copy = processed.copy()
-        # Set excluded areas to a distinct pattern
+        # Set excluded areas to a checkerboard pattern
         mask = processed <= params.background_threshold
-        # Create a checkerboard pattern for excluded areas
-        for y in range(0, processed.shape[0], 10):
-            for x in range(0, processed.shape[1], 10):
-                if mask[y:min(y+5, processed.shape[0]), x:min(x+5, processed.shape[1])].any():
-                    vis_copy[y:min(y+5, processed.shape[0]), x:min(x+5, processed.shape[1])] = 0
-        processed = vis_copy
+        processed[background_pattern_mask(mask)] = 0
     
     return processed
 
-def generate_depth_map(image_path: str, output_path: str, params: DepthMapParams = None) -> None:
+def infer_depth(images: List[Image.Image]) -> List[np.ndarray]:
+    """Run Depth Anything V2 on images in one forward pass, returning normalized uint8 depth"""
+    estimator = get_depth_estimator()
+    
+    # Cap the model input so inference cost does not depend on the photo's resolution
+    working = []
+    for image in images:
+        size = working_size(image.size, INFERENCE_MAX_EDGE)
+        working.append(image.resize(size, Image.LANCZOS) if size != image.size else image)
+    
+    results = []
+    for image, depth in zip(images, estimator.estimate_depth_batch(working)):
+        if depth.shape[::-1] != image.size:
+            # Back to the full-resolution DXF grid, taking edges from the original photo
+            guide = np.asarray(image.convert("L"))
+            depth = guided_upsample(depth, guide, UPSAMPLE_RADIUS, UPSAMPLE_EPS)
+        results.append(normalize_depth(depth))
+    return results
+
+def infer_tiled_depth(image: Image.Image, tile_size: int, tile_overlap: int) -> np.ndarray:
+    """Run Depth Anything V2 over overlapping tiles, returning normalized uint8 depth"""
+    estimator = get_depth_estimator()
+    depth = estimate_tiled_depth(
+        image, estimator.estimate_depth_batch, tile_size, tile_overlap, INFERENCE_BATCH_SIZE
+    )
+    return normalize_depth(depth)
+
+def depth_cache_key(image_path: str, params: DepthMapParams = None, content_hash: str = None) -> str:
+    """Cache key for an image's raw depth: content hash plus everything that shapes inference"""
+    pipeline = hashlib.sha256(json.dumps(pipeline_fingerprint(), sort_keys=True).encode()).hexdigest()[:16]
+    cache_key = f"{content_hash or file_content_hash(image_path)}-{pipeline}"
+    if params and params.tile_size > 0:
+        cache_key += f"-tile{params.tile_size}x{params.tile_overlap}"
+    return cache_key
+
+def estimate_raw_depth(image_path: str, params: DepthMapParams = None, content_hash: str = None) -> np.ndarray:
+    """Normalized uint8 model depth for an image, cached by content hash"""
+    cache_key = depth_cache_key(image_path, params, content_hash)
+    depth_normalized = depth_cache.get(cache_key)
+    if depth_normalized is not None:
+        return depth_normalized
+    
+    image = Image.open(image_path).convert("RGB")
+    if params and params.tile_size > 0:
+        depth_normalized = infer_tiled_depth(image, params.tile_size, params.tile_overlap)
+    else:
+        depth_normalized = infer_depth([image])[0]
+    
+    depth_cache.put(cache_key, depth_normalized)
+    return depth_normalized
+
+def estimate_raw_depth_batch(image_paths: List[str], params: DepthMapParams = None, content_hashes: List[str] = None) -> List[np.ndarray]:
+    """Normalized uint8 model depth for many images, running cache misses in mini-batches"""
+    content_hashes = content_hashes or [None] * len(image_paths)
+    if params and params.tile_size > 0:
+        # Tiles are already batched within each image
+        return [estimate_raw_depth(path, params, content_hash) for path, content_hash in zip(image_paths, content_hashes)]
+    
+    results = [None] * len(image_paths)
+    cache_keys = [depth_cache_key(path, content_hash=content_hash) for path, content_hash in zip(image_paths, content_hashes)]
+    
+    # The processor cannot pad images to a common shape, so a mini-batch must
+    # share one model input shape; photos of different sizes often do. Every
+    # backend resizes each result to its own input, so a photo gets the same
+    # depth here as through estimate_raw_depth and can share its cache entry
+    buckets = defaultdict(list)
+    for index, cache_key in enumerate(cache_keys):
+        cached = depth_cache.get(cache_key)
+        if cached is not None:
+            results[index] = cached
+            continue
+        with Image.open(image_paths[index]) as image:
+            buckets[model_input_size(working_size(image.size, INFERENCE_MAX_EDGE))].append(index)
+    
+    for indices in buckets.values():
+        for start in range(0, len(indices), INFERENCE_BATCH_SIZE):
+            chunk = indices[start:start + INFERENCE_BATCH_SIZE]
+            images = [Image.open(image_paths[index]).convert("RGB") for index in chunk]
+            for index, depth_normalized in zip(chunk, infer_depth(images)):
+                depth_cache.put(cache_keys[index], depth_normalized)
+                results[index] = depth_normalized
+    
+    return results
+
+def save_depth_map(depth_normalized: np.ndarray, output_path: str, params: DepthMapParams = None) -> None:
+    """Apply processing parameters and write the depth map PNG"""
+    if params:
+        depth_normalized = apply_depth_parameters(depth_normalized, params)
+    
+    depth_image = Image.fromarray(depth_normalized, mode='L')
+    depth_image.save(output_path, "PNG")
+
+def generate_depth_map(image_path: str, output_path: str, params: DepthMapParams = None, content_hash: str = None) -> None:
     """Generate depth map from image using Depth Anything V2"""
     try:
-        image = Image.open(image_path).convert("RGB")
-        
-        estimator = get_depth_estimator()
-        depth = estimator(image)["depth"]
-        
-        depth_array = np.array(depth)
-        depth_normalized = ((depth_array - depth_array.min()) / 
-                          (depth_array.max() - depth_array.min()) * 255).astype(np.uint8)
-        
-        # Apply processing parameters if provided
-        if params:
-            depth_normalized = apply_depth_parameters(depth_normalized, params)
-        
-        depth_image = Image.fromarray(depth_normalized, mode='L')
-        depth_image.save(output_path, "PNG")
+        # Inference only runs on a cache miss; parameters are re-applied every time
+        depth_normalized = estimate_raw_depth(image_path, params, content_hash)
+        save_depth_map(depth_normalized, output_path, params)
         
     except Exception as e:
         # Log the full error for debugging
@@ -250,8 +444,8 @@ def generate_depth_map(image_path: str, output_path: str, params: DepthMapParams
         print(f"Depth map generation error: {error_details}")
         raise HTTPException(500, f"Depth map generation failed: {str(e)}")
 
-def depth_map_to_dxf(depth_map_path: str, dxf_path: str, background_threshold: int = 10, original_image_path: str = None) -> None:
-    """Convert depth map to DXF point cloud for laser etching"""
+def depth_map_to_dxf(depth_map_path: str, dxf_path: str, background_threshold: int = 10, original_image_path: str = None, points_path: str = None) -> None:
+    """Convert depth map to DXF point cloud for laser etching, optionally also as binary float32"""
     try:
         depth_image = cv2.imread(depth_map_path, cv2.IMREAD_GRAYSCALE)
         if depth_image is None:
@@ -264,77 +458,133 @@ def depth_map_to_dxf(depth_map_path: str, dxf_path: str, background_threshold: i
             if original_image is None:
                 print(f"Warning: Could not load original image from {original_image_path}")
         
-        height, width = depth_image.shape
-        
-        doc = ezdxf.new('R12')
-        msp = doc.modelspace()
-        
-        # Create Venus3D layer to match other company's format
-        doc.layers.new(name='Venus3D')
-        
-        # Calculate center offset to center coordinates around origin
-        center_x = width / 2.0
-        center_y = height / 2.0
+        points = extract_points(depth_image, MAX_DEPTH_MM, original_image, background_threshold)
         
-        # Use sampling rate of 1 for maximum detail
-        sampling_rate = 1
-        
-        points_added = 0
-        for y in range(0, height, sampling_rate):
-            for x in range(0, width, sampling_rate):
-                depth_value = depth_image[y, x]
-                
-                # Check if we should include this point
-                include_point = True
-                
-                # First check against the original image if available
-                if original_image is not None:
-                    original_value = original_image[y, x]
-                    # Exclude dark areas in the original image
-                    if original_value <= background_threshold:
-                        include_point = False
-                else:
-                    # Fallback to depth map threshold
-                    if depth_value <= background_threshold:
-                        include_point = False
-                
-                if include_point and depth_value > 0:
-                    # Convert to mm depth (allowing negative values for better range)
-                    z = (depth_value / 255.0) * MAX_DEPTH_MM - (MAX_DEPTH_MM / 4.0)
-                    
-                    # Center coordinates around origin (0,0) like the other company's format
-                    x_centered = (x - center_x) * 0.1  # Scale down to mm
-                    y_centered = (center_y - y) * 0.1  # Flip Y and scale to mm
-                    
-                    # Add point to Venus3D layer
-                    point = msp.add_point((x_centered, y_centered, z))
-                    point.dxf.layer = 'Venus3D'
-                    points_added += 1
+        # Stream POINT entities on the Venus3D layer to match other company's format
+        points_added = write_points_dxf(points, dxf_path)
         
-        doc.saveas(dxf_path)
+        # Same cloud for the 3D viewer, so it never has to parse DXF text,
+        # plus coarser levels it can show first
+        if points_path:
+            lod_counts = save_lod_pyramid(points, points_path)
+            print(f"Point cloud LOD levels: {', '.join(map(str, lod_counts))} points")
         print(f"DXF created with {points_added} points on Venus3D layer")
         
     except Exception as e:
         raise HTTPException(500, f"DXF generation failed: {str(e)}")
 
+def convert_image(image_path: str, depth_map_path: str, dxf_path: str, points_path: str, params: DepthMapParams, content_hash: str = None) -> None:
+    """Run the full conversion: depth map, then DXF and binary point clouds"""
+    generate_depth_map(image_path, depth_map_path, params, content_hash)
+    depth_map_to_dxf(depth_map_path, dxf_path, params.background_threshold, image_path, points_path)
+
+def render_preview(image_path: str, params: DepthMapParams, image_format: str = "png") -> bytes:
+    """Generate a depth map preview encoded in memory as PNG or lossless WebP"""
+    depth_normalized = estimate_raw_depth(str(image_path), params)
+    processed = apply_depth_parameters(depth_normalized, params)
+    if image_format == "webp":
+        # Quality above 100 selects lossless WebP
+        ok, encoded = cv2.imencode(".webp", processed, [cv2.IMWRITE_WEBP_QUALITY, 101])
+    else:
+        ok, encoded = cv2.imencode(".png", processed)
+    if not ok:
+        raise ValueError(f"Failed to encode {image_format} preview")
+    return encoded.tobytes()
+
+def analyze_dxf_file(dxf_path: str) -> Dict:
+    """Count POINT entities and compute their bounds, plus layer and entity histograms"""
+    analysis, method = analyze_dxf(dxf_path)
+    
+    if analysis["point_count"] == 0:
+        raise ValueError("No points found in DXF file")
+    
+    print(f"Analyzed DXF with {analysis['point_count']} points ({method})")
+    return analysis
+
+def save_project(
+    db: Session,
+    user_id: int,
+    unique_id: str,
+    params: DepthMapParams,
+    project_name: str,
+    project_description: Optional[str],
+    original_filename: str,
+    depth_map_filename: str,
+    dxf_filename: str
+) -> Project:
+    """Record a completed conversion as a project with its three files"""
+    project = Project(
+        user_id=user_id,
+        name=project_name,
+        description=project_description or "",
+        uuid=unique_id,
+        blur_amount=params.blur_amount,
+        contrast=params.contrast,
+        brightness=params.brightness,
+        edge_enhancement=params.edge_enhancement,
+        invert_depth=params.invert_depth,
+        background_threshold=params.background_threshold
+    )
+    db.add(project)
+    db.flush()  # Get the project ID
+    
+    # Get file sizes
+    original_size = os.path.getsize(STATIC_DIR / original_filename)
+    depth_map_size = os.path.getsize(STATIC_DIR / depth_map_filename)
+    dxf_size = os.path.getsize(STATIC_DIR / dxf_filename)
+    
+    # Create file records
+    original_file = ProjectFile(
+        project_id=project.id,
+        file_type="original",
+        filename=original_filename,
+        file_path=f"/static/{original_filename}",
+        file_size=original_size,
+        mime_type="image/" + Path(original_filename).suffix.lstrip('.')
+    )
+    depth_file = ProjectFile(
+        project_id=project.id,
+        file_type="depth_map",
+        filename=depth_map_filename,
+        file_path=f"/static/{depth_map_filename}",
+        file_size=depth_map_size,
+        mime_type="image/png"
+    )
+    dxf_file = ProjectFile(
+        project_id=project.id,
+        file_type="dxf",
+        filename=dxf_filename,
+        file_path=f"/static/{dxf_filename}",
+        file_size=dxf_size,
+        mime_type="application/dxf"
+    )
+    
+    db.add_all([original_file, depth_file, dxf_file])
+    db.commit()
+    return project
+
 @app.get("/")
 async def root():
     return {
         "message": "Crystal Etching Converter API", 
-        "endpoints": ["/process", "/files", "/register", "/token", "/users/me", "/projects"]
+        "endpoints": ["/process", "/jobs", "/points", "/files", "/register", "/token", "/users/me", "/projects"]
     }
 
 # Authentication endpoints
+def client_ip(request: Request) -> str:
+    """Client address for sign-in shaping (uvicorn resolves X-Forwarded-For from trusted proxies)"""
+    return request.client.host if request.client else "unknown"
+
 @app.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, request: Request, db: Session = Depends(get_db)):
     """Register a new user"""
-    db_user = create_user(db, user_data)
+    db_user = await create_user(db, user_data, client_ip(request))
     return db_user
 
 @app.post("/token", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login with username (email) and password to get access token"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password, client_ip(request))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -344,14 +594,14 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/login", response_model=Token)
-async def login_json(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login_json(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     """Alternative login endpoint that accepts JSON instead of form data"""
-    user = authenticate_user(db, login_data.email, login_data.password)
+    user = await authenticate_user(db, login_data.email, login_data.password, client_ip(request))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -360,7 +610,7 @@ async def login_json(login_data: LoginRequest, db: Session = Depends(get_db)):
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -369,6 +619,11 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
     """Get current user information"""
     return current_user
 
+@app.get("/auth/stats")
+async def auth_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """Authenticated-user cache counters (admin only)"""
+    return user_cache.stats()
+
 @app.get("/users", response_model=List[UserResponse])
 async def list_users(
     current_user: User = Depends(get_current_admin_user),
@@ -383,17 +638,25 @@ async def list_users(
 async def list_projects(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None
 ):
-    """List user's projects"""
-    projects = db.query(Project).filter(
-        Project.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    
-    total = db.query(Project).filter(Project.user_id == current_user.id).count()
+    """List user's projects newest first with their files, one keyset page at a time"""
+    # The first page also counts every project in the same query, before LIMIT applies
+    query = db.query(Project, func.count().over()) if not cursor else db.query(Project)
+    query = query.filter(Project.user_id == current_user.id).options(selectinload(Project.files))
+    try:
+        rows, next_cursor = page(query, Project.created_at, Project.id, True, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     
-    return {"projects": projects, "total": total}
+    if cursor:
+        return {"projects": rows, "total": None, "next_cursor": next_cursor}
+    return {
+        "projects": [project for project, _ in rows],
+        "total": rows[0][1] if rows else 0,
+        "next_cursor": next_cursor
+    }
 
 @app.get("/projects/{project_id}", response_model=ProjectResponse)
 async def get_project(
@@ -402,7 +665,7 @@ async def get_project(
     db: Session = Depends(get_db)
 ):
     """Get a specific project"""
-    project = db.query(Project).filter(
+    project = db.query(Project).options(selectinload(Project.files)).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
     ).first()
@@ -420,7 +683,7 @@ async def update_project(
     db: Session = Depends(get_db)
 ):
     """Update project details"""
-    project = db.query(Project).filter(
+    project = db.query(Project).options(selectinload(Project.files)).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
     ).first()
@@ -445,7 +708,7 @@ async def delete_project(
     db: Session = Depends(get_db)
 ):
     """Delete a project and all associated files"""
-    project = db.query(Project).filter(
+    project = db.query(Project).options(selectinload(Project.files)).filter(
         Project.id == project_id,
         Project.user_id == current_user.id
     ).first()
@@ -468,12 +731,7 @@ async def delete_project(
 @app.post("/process", response_model=ProcessingResponse)
 async def process_image(
     image: UploadFile = File(...),
-    blur_amount: float = Form(0),
-    contrast: float = Form(1.0),
-    brightness: int = Form(0),
-    edge_enhancement: float = Form(0),
-    invert_depth: bool = Form(False),
-    background_threshold: int = Form(10),
+    params: DepthMapParams = Depends(depth_params_form),
     project_name: Optional[str] = Form(None),
     project_description: Optional[str] = Form(None),
     current_user: Optional[User] = Depends(get_current_user_optional),
@@ -482,30 +740,13 @@ async def process_image(
     """Process uploaded image to generate depth map and DXF with custom parameters"""
     
     validate_image_file(image)
-    
-    # Create parameter object
-    params = DepthMapParams(
-        blur_amount=blur_amount,
-        contrast=contrast,
-        brightness=brightness,
-        edge_enhancement=edge_enhancement,
-        invert_depth=invert_depth,
-        background_threshold=background_threshold
-    )
-    
-    unique_id = str(uuid.uuid4())
-    temp_dir = Path(tempfile.mkdtemp())
+    check_capacity()
     
     try:
-        input_path = temp_dir / f"input_{unique_id}{Path(image.filename).suffix}"
-        with open(input_path, "wb") as f:
-            content = await image.read()
-            f.write(content)
-        
-        # Save the original image
-        original_filename = f"original_{unique_id}{Path(image.filename).suffix}"
+        # The id is derived from the image, pipeline and parameters, so a repeat
+        # of an earlier conversion lands on its existing files
+        unique_id, original_filename, content_hash = await store_upload(image, params)
         original_path = STATIC_DIR / original_filename
-        shutil.copy2(input_path, original_path)
         
         depth_map_filename = f"depth_map_{unique_id}.png"
         dxf_filename = f"output_{unique_id}.dxf"
@@ -513,67 +754,30 @@ async def process_image(
         depth_map_path = STATIC_DIR / depth_map_filename
         dxf_path = STATIC_DIR / dxf_filename
         
-        generate_depth_map(str(input_path), str(depth_map_path), params)
+        async with conversion_lock(unique_id):
+            reused = conversion_complete(unique_id)
+            if reused:
+                touch_conversion(unique_id)
+            else:
+                await run_in_worker(
+                    convert_image, str(original_path), str(depth_map_path), str(dxf_path),
+                    str(STATIC_DIR / f"points_{unique_id}.bin"), params, content_hash
+                )
         
-        depth_map_to_dxf(str(depth_map_path), str(dxf_path), background_threshold, str(original_path))
+        update_catalog(db, [original_filename, depth_map_filename, dxf_filename])
         
         # Save project if user is authenticated and project_name is provided
         if current_user and project_name:
-            # Create project record
-            project = Project(
-                user_id=current_user.id,
-                name=project_name,
-                description=project_description or "",
-                uuid=unique_id,
-                blur_amount=blur_amount,
-                contrast=contrast,
-                brightness=brightness,
-                edge_enhancement=edge_enhancement,
-                invert_depth=invert_depth,
-                background_threshold=background_threshold
-            )
-            db.add(project)
-            db.flush()  # Get the project ID
-            
-            # Get file sizes
-            original_size = os.path.getsize(original_path)
-            depth_map_size = os.path.getsize(depth_map_path)
-            dxf_size = os.path.getsize(dxf_path)
-            
-            # Create file records
-            original_file = ProjectFile(
-                project_id=project.id,
-                file_type="original",
-                filename=original_filename,
-                file_path=f"/static/{original_filename}",
-                file_size=original_size,
-                mime_type="image/" + Path(image.filename).suffix.lstrip('.')
-            )
-            depth_file = ProjectFile(
-                project_id=project.id,
-                file_type="depth_map",
-                filename=depth_map_filename,
-                file_path=f"/static/{depth_map_filename}",
-                file_size=depth_map_size,
-                mime_type="image/png"
+            save_project(
+                db, current_user.id, str(uuid.uuid4()), params, project_name, project_description,
+                original_filename, depth_map_filename, dxf_filename
             )
-            dxf_file = ProjectFile(
-                project_id=project.id,
-                file_type="dxf",
-                filename=dxf_filename,
-                file_path=f"/static/{dxf_filename}",
-                file_size=dxf_size,
-                mime_type="application/dxf"
-            )
-            
-            db.add_all([original_file, depth_file, dxf_file])
-            db.commit()
         
         return ProcessingResponse(
             original_url=f"/static/{original_filename}",
             depth_map_url=f"/static/{depth_map_filename}",
             dxf_url=f"/static/{dxf_filename}",
-            message="Processing completed successfully",
+            message="Reused existing conversion" if reused else "Processing completed successfully",
             parameters_used=params.dict()
         )
         
@@ -581,88 +785,462 @@ async def process_image(
         raise
     except Exception as e:
         raise HTTPException(500, f"Processing failed: {str(e)}")
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
 
-class PreviewRequest(BaseModel):
-    image_url: str
-    blur_amount: float = 0
-    contrast: float = 1.0
-    brightness: int = 0
-    edge_enhancement: float = 0
-    invert_depth: bool = False
-    background_threshold: int = 10
+def update_catalog(db: Session, filenames: List[str]) -> None:
+    """Record static files just written or removed; the periodic rescan repairs any miss"""
+    try:
+        sync_files(db, STATIC_DIR, filenames)
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Failed to update file catalogue: {e}")
 
-@app.post("/preview")
-async def preview_depth_map(request: PreviewRequest):
-    """Generate a preview of depth map with given parameters"""
+def pipeline_fingerprint() -> Dict:
+    """Everything besides the image and DepthMapParams that shapes conversion output"""
+    fingerprint = {
+        "backend": DEPTH_BACKEND,
+        "model": DEPTH_MODEL,
+        "inference_max_edge": INFERENCE_MAX_EDGE,
+        "upsample": [UPSAMPLE_RADIUS, UPSAMPLE_EPS],
+        "max_depth_mm": MAX_DEPTH_MM,
+    }
+    if DEPTH_BACKEND == "onnx":
+        # A re-exported model at another path can give different depth
+        fingerprint["onnx_model"] = ONNX_MODEL_PATH
+    return fingerprint
+
+def conversion_lock(unique_id: str) -> asyncio.Lock:
+    lock = conversion_locks.get(unique_id)
+    if lock is None:
+        lock = conversion_locks[unique_id] = asyncio.Lock()
+    return lock
+
+def conversion_complete(unique_id: str) -> bool:
+    """Whether every artifact of a conversion is on disk (the point cloud sidecar is written last)"""
+    return all((STATIC_DIR / name).exists() for name in (
+        f"depth_map_{unique_id}.png",
+        f"output_{unique_id}.dxf",
+        f"points_{unique_id}.json"
+    ))
+
+def conversion_files(unique_id: str) -> List[str]:
+    """Every static file a conversion can own, whether or not it exists"""
+    return [f"original_{unique_id}{suffix}" for suffix in ('.png', '.jpg', '.jpeg')] + [
+        f"depth_map_{unique_id}.png",
+        f"output_{unique_id}.dxf",
+        f"points_{unique_id}.bin",
+        f"points_{unique_id}.json"
+    ] + [f"points_{unique_id}_lod{level}.bin" for level in range(1, len(LOD_CELL_PIXELS) + 1)]
+
+def touch_conversion(unique_id: str) -> None:
+    """Mark reused artifacts as recent so file listings show them first"""
+    for name in conversion_files(unique_id):
+        try:
+            os.utime(STATIC_DIR / name)
+        except FileNotFoundError:
+            pass
+
+async def store_upload(image: UploadFile, params: DepthMapParams):
+    """Stream an image upload into the artifact store, returning (conversion id, original filename, content hash)"""
+    suffix = Path(image.filename).suffix
+    upload_path = new_upload_path(suffix)
+    content_hash = await save_upload(image, upload_path, MAX_FILE_SIZE)
+    unique_id = conversion_id(content_hash, pipeline_fingerprint(), params.dict())
+    original_filename = f"original_{unique_id}{suffix}"
+    store_original(upload_path, content_hash, STATIC_DIR / original_filename)
+    return unique_id, original_filename, content_hash
+
+def finish_conversion(depth_normalized: np.ndarray, depth_map_path: str, dxf_path: str, original_path: str, points_path: str, params: DepthMapParams) -> None:
+    """Post-process an inferred depth map and write its DXF and binary point clouds"""
+    save_depth_map(depth_normalized, depth_map_path, params)
+    depth_map_to_dxf(depth_map_path, dxf_path, params.background_threshold, original_path, points_path)
+
+@app.post("/process/batch", response_model=BatchProcessingResponse)
+async def process_batch(
+    images: List[UploadFile] = File(...),
+    params: DepthMapParams = Depends(depth_params_form),
+    project_name: Optional[str] = Form(None),
+    project_description: Optional[str] = Form(None),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db)
+):
+    """Process many images with identical parameters, batching model inference"""
     
-    # Create cache key from request parameters
-    cache_key = hashlib.md5(
-        f"{request.image_url}_{request.blur_amount}_{request.contrast}_{request.brightness}_{request.edge_enhancement}_{request.invert_depth}_{request.background_threshold}".encode()
-    ).hexdigest()
-    
-    # Check cache
-    current_time = time.time()
-    if cache_key in preview_cache:
-        cached_data, timestamp = preview_cache[cache_key]
-        if current_time - timestamp < CACHE_EXPIRY:
-            return cached_data
-        else:
-            # Remove expired entry
-            del preview_cache[cache_key]
-    
-    # Clean up old cache entries
-    expired_keys = [k for k, (_, t) in preview_cache.items() if current_time - t >= CACHE_EXPIRY]
-    for k in expired_keys:
-        del preview_cache[k]
-    
-    # Create parameter object
-    params = DepthMapParams(
-        blur_amount=request.blur_amount,
-        contrast=request.contrast,
-        brightness=request.brightness,
-        edge_enhancement=request.edge_enhancement,
-        invert_depth=request.invert_depth,
-        background_threshold=request.background_threshold
-    )
+    if len(images) > MAX_BATCH_IMAGES:
+        raise HTTPException(400, f"At most {MAX_BATCH_IMAGES} images can be processed in one batch")
+    for image in images:
+        validate_image_file(image)
+    check_capacity()
     
+    start_time = time.time()
+    unique_ids = []
+    original_filenames = []
+    content_hashes = []
     try:
-        # Extract filename from URL
-        filename = request.image_url.split('/')[-1]
-        if not filename.startswith('original_'):
-            raise HTTPException(400, "Invalid image URL")
+        for image in images:
+            unique_id, original_filename, content_hash = await store_upload(image, params)
+            unique_ids.append(unique_id)
+            original_filenames.append(original_filename)
+            content_hashes.append(content_hash)
         
-        image_path = STATIC_DIR / filename
-        if not image_path.exists():
-            raise HTTPException(404, "Image not found")
+        # Each distinct conversion is produced once; repeats and earlier results are reused.
+        # Locks are taken in sorted order so overlapping batches cannot deadlock.
+        async with AsyncExitStack() as stack:
+            for unique_id in sorted(set(unique_ids)):
+                await stack.enter_async_context(conversion_lock(unique_id))
+            
+            pending = {}
+            for unique_id, original_filename, content_hash in zip(unique_ids, original_filenames, content_hashes):
+                if unique_id not in pending and not conversion_complete(unique_id):
+                    pending[unique_id] = (str(STATIC_DIR / original_filename), content_hash)
+            reused = set(unique_ids) - set(pending)
+            for unique_id in reused:
+                touch_conversion(unique_id)
+            
+            if pending:
+                pending_ids = list(pending)
+                original_paths = [pending[unique_id][0] for unique_id in pending_ids]
+                depth_maps = await run_in_worker(
+                    estimate_raw_depth_batch, original_paths, params,
+                    [pending[unique_id][1] for unique_id in pending_ids]
+                )
+                
+                # Fan post-processing and DXF writing out across the worker pool
+                await asyncio.gather(*(
+                    run_job_stage(
+                        finish_conversion,
+                        depth_normalized,
+                        str(STATIC_DIR / f"depth_map_{unique_id}.png"),
+                        str(STATIC_DIR / f"output_{unique_id}.dxf"),
+                        original_path,
+                        str(STATIC_DIR / f"points_{unique_id}.bin"),
+                        params
+                    )
+                    for unique_id, original_path, depth_normalized in zip(pending_ids, original_paths, depth_maps)
+                ))
         
-        # Generate preview in memory
-        temp_output = Path(tempfile.mktemp(suffix='.png'))
+        update_catalog(db, [
+            filename
+            for unique_id, original_filename in zip(unique_ids, original_filenames)
+            for filename in (original_filename, f"depth_map_{unique_id}.png", f"output_{unique_id}.dxf")
+        ])
         
-        generate_depth_map(str(image_path), str(temp_output), params)
+        results = []
+        for index, (unique_id, original_filename) in enumerate(zip(unique_ids, original_filenames), start=1):
+            depth_map_filename = f"depth_map_{unique_id}.png"
+            dxf_filename = f"output_{unique_id}.dxf"
+            
+            if current_user and project_name:
+                save_project(
+                    db, current_user.id, str(uuid.uuid4()), params, f"{project_name} #{index}", project_description,
+                    original_filename, depth_map_filename, dxf_filename
+                )
+            
+            results.append(ProcessingResponse(
+                original_url=f"/static/{original_filename}",
+                depth_map_url=f"/static/{depth_map_filename}",
+                dxf_url=f"/static/{dxf_filename}",
+                message="Reused existing conversion" if unique_id in reused else "Processing completed successfully",
+                parameters_used=params.dict()
+            ))
         
-        # Read the preview image
-        with open(temp_output, 'rb') as f:
-            preview_data = f.read()
+        elapsed = time.time() - start_time
+        return BatchProcessingResponse(
+            results=results,
+            message=f"Processed {len(results)} images",
+            parameters_used=params.dict(),
+            elapsed_seconds=round(elapsed, 3),
+            images_per_second=round(len(results) / elapsed, 3) if elapsed > 0 else 0.0
+        )
         
-        # Clean up temp file
-        temp_output.unlink()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Batch processing failed: {str(e)}")
+
+@app.post("/jobs", response_model=JobCreatedResponse, status_code=202)
+async def create_job(
+    image: UploadFile = File(...),
+    params: DepthMapParams = Depends(depth_params_form),
+    project_name: Optional[str] = Form(None),
+    project_description: Optional[str] = Form(None),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db)
+):
+    """Queue an image for conversion and return a job id immediately"""
+    
+    validate_image_file(image)
+    
+    unique_id = str(uuid.uuid4())
+    original_filename = f"original_{unique_id}{Path(image.filename).suffix}"
+    
+    # The original is the job's only input, so keep it where a restarted worker can find it
+    await save_upload(image, STATIC_DIR / original_filename, MAX_FILE_SIZE)
+    update_catalog(db, [original_filename])
+    
+    job = ConversionJob(
+        uuid=unique_id,
+        user_id=current_user.id if current_user else None,
+        state="queued",
+        stage="inference",
+        parameters=json.dumps(params.dict()),
+        original_filename=original_filename,
+        project_name=project_name if current_user else None,
+        project_description=project_description
+    )
+    db.add(job)
+    db.commit()
+    job_wakeup.set()
+    
+    return JobCreatedResponse(
+        job_id=unique_id,
+        state=job.state,
+        status_url=f"/jobs/{unique_id}",
+        result_url=f"/jobs/{unique_id}/result"
+    )
+
+def get_job_or_404(db: Session, job_id: str) -> ConversionJob:
+    job = db.query(ConversionJob).filter(ConversionJob.uuid == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str, db: Session = Depends(get_db)):
+    """Report a job's state and per-stage progress"""
+    job = get_job_or_404(db, job_id)
+    
+    current = JOB_STAGES.index(job.stage)
+    stages = {}
+    for index, stage in enumerate(JOB_STAGES):
+        if job.state == "completed" or index < current:
+            stages[stage] = "completed"
+        elif index == current and job.state in ("running", "failed"):
+            stages[stage] = job.state
+        else:
+            stages[stage] = "pending"
+    completed = sum(1 for value in stages.values() if value == "completed")
+    
+    return JobStatusResponse(
+        job_id=job.uuid,
+        state=job.state,
+        stage=job.stage,
+        progress=completed * 100 // len(JOB_STAGES),
+        stages=stages,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        finished_at=job.finished_at
+    )
+
+@app.get("/jobs/{job_id}/result", response_model=ProcessingResponse)
+async def get_job_result(job_id: str, db: Session = Depends(get_db)):
+    """Return the file URLs of a completed job"""
+    job = get_job_or_404(db, job_id)
+    
+    if job.state == "failed":
+        raise HTTPException(500, f"Processing failed: {job.error}")
+    if job.state != "completed":
+        raise HTTPException(409, f"Job is still {job.state}")
+    
+    return ProcessingResponse(
+        original_url=f"/static/{job.original_filename}",
+        depth_map_url=f"/static/depth_map_{job.uuid}.png",
+        dxf_url=f"/static/output_{job.uuid}.dxf",
+        message="Processing completed successfully",
+        parameters_used=json.loads(job.parameters)
+    )
+
+async def run_job_stage(func, *args):
+    """Run a stage on the worker pool, waiting for capacity instead of failing"""
+    while True:
+        try:
+            return await run_in_worker(func, *args)
+        except HTTPException as e:
+            if e.status_code != 503:
+                raise
+            await asyncio.sleep(BUSY_RETRY_AFTER_SECONDS)
+
+def claim_next_job() -> Optional[str]:
+    """Atomically move the oldest queued job to running and return its id"""
+    db = SessionLocal()
+    try:
+        while True:
+            job = db.query(ConversionJob).filter(
+                ConversionJob.state == "queued"
+            ).order_by(ConversionJob.id).first()
+            if job is None:
+                return None
+            
+            # Another worker may have claimed it between the select and the update
+            claimed = db.query(ConversionJob).filter(
+                ConversionJob.id == job.id,
+                ConversionJob.state == "queued"
+            ).update({"state": "running", "worker_pid": os.getpid()}, synchronize_session=False)
+            db.commit()
+            if claimed:
+                return job.uuid
+    finally:
+        db.close()
+
+async def run_job(job_id: str) -> None:
+    """Run every conversion stage for a claimed job, recording progress as it goes"""
+    db = SessionLocal()
+    try:
+        job = db.query(ConversionJob).filter(ConversionJob.uuid == job_id).first()
+        params = DepthMapParams(**json.loads(job.parameters))
         
-        # Return base64 encoded preview
-        import base64
-        preview_base64 = base64.b64encode(preview_data).decode('utf-8')
+        original_path = STATIC_DIR / job.original_filename
+        depth_map_filename = f"depth_map_{job.uuid}.png"
+        dxf_filename = f"output_{job.uuid}.dxf"
+        depth_map_path = STATIC_DIR / depth_map_filename
+        dxf_path = STATIC_DIR / dxf_filename
         
-        result = {
-            "preview": f"data:image/png;base64,{preview_base64}",
-            "parameters": params.dict()
-        }
+        try:
+            job.stage = "inference"
+            db.commit()
+            depth_normalized = await run_job_stage(estimate_raw_depth, str(original_path), params)
+            
+            job.stage = "post_process"
+            db.commit()
+            await run_job_stage(save_depth_map, depth_normalized, str(depth_map_path), params)
+            
+            job.stage = "dxf_write"
+            db.commit()
+            await run_job_stage(
+                depth_map_to_dxf, str(depth_map_path), str(dxf_path), params.background_threshold, str(original_path),
+                str(STATIC_DIR / f"points_{job.uuid}.bin")
+            )
+            
+            if job.user_id and job.project_name:
+                save_project(
+                    db, job.user_id, job.uuid, params, job.project_name, job.project_description,
+                    job.original_filename, depth_map_filename, dxf_filename
+                )
+            
+            update_catalog(db, [depth_map_filename, dxf_filename])
+            job.state = "completed"
+        except Exception as e:
+            db.rollback()
+            import traceback
+            print(f"Job {job_id} failed: {traceback.format_exc()}")
+            job.state = "failed"
+            job.error = e.detail if isinstance(e, HTTPException) else str(e)
         
-        # Store in cache
-        preview_cache[cache_key] = (result, current_time)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+def mark_job_failed(job_id: str, error: str) -> None:
+    """Fail a job that run_job could not finish recording, if it is still marked running"""
+    db = SessionLocal()
+    try:
+        db.query(ConversionJob).filter(
+            ConversionJob.uuid == job_id,
+            ConversionJob.state == "running"
+        ).update({"state": "failed", "error": error, "finished_at": datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def requeue_interrupted_jobs(worker_pid: Optional[int] = None) -> None:
+    """Put jobs left running by a previous worker back on the queue
+
+    With worker_pid, only the jobs that process claimed; otherwise every running job.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(ConversionJob).filter(ConversionJob.state == "running")
+        if worker_pid is not None:
+            query = query.filter(ConversionJob.worker_pid == worker_pid)
+        requeued = query.update({"state": "queued", "worker_pid": None}, synchronize_session=False)
+        db.commit()
+        if requeued:
+            print(f"Requeued {requeued} interrupted conversion jobs")
+    finally:
+        db.close()
+
+def rescan_static() -> tuple:
+    db = SessionLocal()
+    try:
+        return rescan_catalog(db, STATIC_DIR)
+    finally:
+        db.close()
+
+async def catalog_rescanner():
+    """Reconcile the file catalogue with static/ at startup and then periodically"""
+    while True:
+        try:
+            added, updated, removed = await asyncio.to_thread(rescan_static)
+            if added or updated or removed:
+                print(f"File catalogue rescan: {added} added, {updated} updated, {removed} removed")
+        except Exception as e:
+            print(f"Warning: File catalogue rescan failed: {e}")
+        await asyncio.sleep(CATALOG_RESCAN_SECONDS)
+
+async def job_dispatcher():
+    """Process queued conversion jobs one at a time for the life of the worker"""
+    while True:
+        try:
+            job_id = claim_next_job()
+        except Exception as e:
+            print(f"Warning: Failed to poll conversion jobs: {e}")
+            job_id = None
         
-        return result
+        if job_id:
+            try:
+                await run_job(job_id)
+            except Exception as e:
+                # Anything run_job could not record itself; the dispatcher must outlive it
+                import traceback
+                print(f"Job {job_id} crashed: {traceback.format_exc()}")
+                try:
+                    mark_job_failed(job_id, str(e))
+                except Exception as mark_error:
+                    print(f"Warning: Failed to mark job {job_id} failed: {mark_error}")
+            continue
         
+        try:
+            await asyncio.wait_for(job_wakeup.wait(), timeout=JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        job_wakeup.clear()
+
+class PreviewRequest(DepthMapParams):
+    image_url: str
+
+def preview_params(request: PreviewRequest) -> DepthMapParams:
+    return DepthMapParams(**request.dict(exclude={"image_url"}))
+
+def preview_image_path(image_url: str) -> Path:
+    """Resolve a preview's original from its /static URL"""
+    filename = image_url.split('/')[-1]
+    if not filename.startswith('original_'):
+        raise HTTPException(400, "Invalid image URL")
+    
+    image_path = STATIC_DIR / filename
+    if not image_path.exists():
+        raise HTTPException(404, "Image not found")
+    return image_path
+
+def preview_cache_key(image_path: Path, params: DepthMapParams, image_format: str) -> str:
+    """Identity of a rendered preview: the original file, parameters, format and pipeline"""
+    stat = image_path.stat()
+    return hashlib.sha256(json.dumps({
+        "image": [image_path.name, stat.st_mtime_ns, stat.st_size],
+        "params": params.dict(),
+        "format": image_format,
+        "pipeline": pipeline_fingerprint()
+    }, sort_keys=True).encode()).hexdigest()
+
+async def get_preview(image_path: Path, params: DepthMapParams, image_format: str, cache_key: str) -> bytes:
+    """Encoded preview from the cache, rendering it on the worker pool on a miss"""
+    try:
+        preview_data = preview_cache.get(cache_key)
+        if preview_data is None:
+            preview_data = await run_in_worker(render_preview, image_path, params, image_format)
+            preview_cache.put(cache_key, preview_data)
+        return preview_data
     except HTTPException:
         raise
     except Exception as e:
@@ -672,6 +1250,49 @@ async def preview_depth_map(request: PreviewRequest):
         print(f"Preview generation error: {error_details}")
         raise HTTPException(500, f"Preview generation failed: {str(e)}")
 
+@app.post("/preview")
+async def preview_depth_map(request: PreviewRequest):
+    """Generate a preview of depth map with given parameters"""
+    params = preview_params(request)
+    image_path = preview_image_path(request.image_url)
+    
+    cache_key = preview_cache_key(image_path, params, "png")
+    preview_data = await get_preview(image_path, params, "png", cache_key)
+    
+    # Return base64 encoded preview
+    import base64
+    preview_base64 = base64.b64encode(preview_data).decode('utf-8')
+    
+    return {
+        "preview": f"data:image/png;base64,{preview_base64}",
+        "parameters": params.dict()
+    }
+
+@app.get("/preview/image")
+async def preview_depth_map_image(
+    http_request: Request,
+    request: PreviewRequest = Depends(),
+    image_format: str = Query("png", alias="format", pattern="^(png|webp)$")
+):
+    """Depth map preview as raw PNG or WebP bytes, revalidated by ETag"""
+    params = preview_params(request)
+    image_path = preview_image_path(request.image_url)
+    
+    # The key fully determines the output, so a matching ETag needs no rendering at all
+    cache_key = preview_cache_key(image_path, params, image_format)
+    etag = f'"{cache_key[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in http_request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    
+    preview_data = await get_preview(image_path, params, image_format, cache_key)
+    return Response(preview_data, media_type=PREVIEW_MEDIA_TYPES[image_format], headers=headers)
+
+@app.get("/preview/stats")
+async def preview_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """Preview cache size and hit/miss/eviction counters (admin only)"""
+    return preview_cache.stats()
+
 @app.post("/upload-dxf")
 async def upload_dxf(
     dxf_file: UploadFile = File(...),
@@ -684,8 +1305,10 @@ async def upload_dxf(
     if not dxf_file.content_type or not dxf_file.filename.lower().endswith('.dxf'):
         raise HTTPException(400, "File must be a DXF file")
     
-    if dxf_file.size and dxf_file.size > MAX_FILE_SIZE:
-        raise HTTPException(400, f"File size must be less than {MAX_FILE_SIZE // 1024 // 1024}MB")
+    if dxf_file.size and dxf_file.size > MAX_DXF_FILE_SIZE:
+        raise HTTPException(400, f"File size must be less than {MAX_DXF_FILE_SIZE // 1024 // 1024}MB")
+    
+    check_capacity()
     
     unique_id = str(uuid.uuid4())
     dxf_filename = f"uploaded_{unique_id}.dxf"
@@ -693,156 +1316,172 @@ async def upload_dxf(
     
     try:
         # Save uploaded DXF
-        content = await dxf_file.read()
-        with open(dxf_path, 'wb') as f:
-            f.write(content)
+        await save_upload(dxf_file, dxf_path, MAX_DXF_FILE_SIZE)
+        update_catalog(db, [dxf_filename])
         
         # Analyze the DXF file
-        doc = ezdxf.readfile(str(dxf_path))
-        msp = doc.modelspace()
-        
-        # Count entities and get bounds
-        point_count = 0
-        min_x = min_y = min_z = float('inf')
-        max_x = max_y = max_z = float('-inf')
-        
-        for entity in msp:
-            if entity.dxftype() == 'POINT':
-                point_count += 1
-                x, y, z = entity.dxf.location
-                min_x = min(min_x, x)
-                max_x = max(max_x, x)
-                min_y = min(min_y, y)
-                max_y = max(max_y, y)
-                min_z = min(min_z, z)
-                max_z = max(max_z, z)
-        
-        if point_count == 0:
-            raise ValueError("No points found in DXF file")
+        analysis = await run_in_worker(analyze_dxf_file, str(dxf_path))
         
         # Return analysis results
         return {
             "success": True,
             "filename": dxf_filename,
             "dxf_url": f"/static/{dxf_filename}",
-            "analysis": {
-                "point_count": point_count,
-                "bounds": {
-                    "x": {"min": min_x, "max": max_x, "range": max_x - min_x},
-                    "y": {"min": min_y, "max": max_y, "range": max_y - min_y},
-                    "z": {"min": min_z, "max": max_z, "range": max_z - min_z}
-                },
-                "dxf_version": doc.dxfversion
-            }
+            "analysis": analysis
         }
         
     except Exception as e:
         # Clean up on error
         if dxf_path.exists():
             dxf_path.unlink()
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(500, f"DXF upload failed: {str(e)}")
 
+def parse_byte_range(range_header: str, size: int):
+    """Parse a single 'bytes=start-end' Range header into an inclusive (start, end)"""
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', range_header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    if match.group(1) == '':
+        # Suffix range: the last N bytes
+        start = max(0, size - int(match.group(2)))
+        end = size - 1
+    else:
+        start = int(match.group(1))
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+    if start > end:
+        raise HTTPException(416, "Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+@app.get("/points/{file_id}")
+async def get_point_cloud(
+    file_id: str,
+    request: Request,
+    level: int = Query(0, ge=0, le=len(LOD_CELL_PIXELS)),
+    max_points: Optional[int] = Query(None, ge=1)
+):
+    """Serve a conversion's point cloud as little-endian float32 x, y, z triples
+    
+    level picks a grid-downsampled LOD (0 = full cloud). max_points further
+    decimates by taking every n-th point. Range requests apply to the returned
+    payload. Count and bounds headers always describe the full cloud and come
+    from the sidecar written with the pyramid, so no points are read here.
+    """
+    if not re.fullmatch(UUID_PATTERN, file_id):
+        raise HTTPException(404, "Point cloud not found")
+    points_path = str(STATIC_DIR / f"points_{file_id}.bin")
+    level_path = lod_path(points_path, level)
+    if not os.path.exists(level_path):
+        raise HTTPException(404, "Point cloud not found")
+    
+    if os.path.exists(meta_path(points_path)):
+        meta = load_point_meta(points_path)
+    else:
+        meta = await run_in_worker(load_point_meta, points_path)
+    level_points = meta["levels"][level]
+    headers = {
+        "Accept-Ranges": "bytes",
+        "X-Point-Count": str(meta["count"]),
+        "X-Point-Format": "float32-le-xyz",
+        "X-Point-Levels": ",".join(map(str, meta["levels"])),
+    }
+    if meta["bounds"]:
+        headers["X-Point-Bounds"] = ",".join(f"{value:.4f}" for value in meta["bounds"])
+    
+    if not max_points or level_points <= max_points:
+        # Served straight from disk; FileResponse answers Range requests itself
+        headers["X-Returned-Points"] = str(level_points)
+        return FileResponse(level_path, media_type="application/octet-stream", headers=headers)
+    
+    payload = await run_in_worker(decimate_points, level_path, max_points)
+    headers["X-Returned-Points"] = str(len(payload) // 12)
+    byte_range = parse_byte_range(request.headers["range"], len(payload)) if "range" in request.headers else None
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(payload)}"
+        return Response(payload[start:end + 1], status_code=206, media_type="application/octet-stream", headers=headers)
+    
+    return Response(payload, media_type="application/octet-stream", headers=headers)
+
 @app.get("/files", response_model=FilesListResponse)
-async def list_files():
-    """List all previously converted files"""
-    files_info = []
-    
-    # Get all files in static directory
-    for file_path in STATIC_DIR.glob("*"):
-        if file_path.is_file() and file_path.suffix in ['.png', '.jpg', '.jpeg', '.dxf']:
-            # Determine file type
-            if file_path.name.startswith('original_'):
-                file_type = 'original'
-            elif file_path.suffix == '.png':
-                file_type = 'depth_map'
-            else:
-                file_type = 'dxf'
-            
-            # Get file stats
-            stat = file_path.stat()
-            
-            files_info.append(FileInfo(
-                filename=file_path.name,
-                timestamp=datetime.fromtimestamp(stat.st_mtime),
-                size=stat.st_size,
-                type=file_type,
-                url=f"/static/{file_path.name}"
-            ))
+async def list_files(
+    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: str = Query("timestamp", pattern="^(timestamp|size|name)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$")
+):
+    """List previously converted files from the catalogue, one keyset page at a time"""
+    sort_column = {"timestamp": CatalogFile.modified_at, "size": CatalogFile.size, "name": CatalogFile.filename}[sort]
+    # The first page also counts the catalogue in the same query; later pages skip the count
+    query = db.query(CatalogFile, func.count().over()) if not cursor else db.query(CatalogFile)
+    try:
+        rows, next_cursor = page(query, sort_column, CatalogFile.id, order == "desc", limit, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     
-    # Sort by timestamp (newest first)
-    files_info.sort(key=lambda x: x.timestamp, reverse=True)
+    total_count = None if cursor else (rows[0][1] if rows else 0)
+    if not cursor:
+        rows = [row for row, _ in rows]
+    
+    files_info = [
+        FileInfo(
+            filename=row.filename,
+            timestamp=row.modified_at.replace(tzinfo=timezone.utc),
+            size=row.size,
+            type=row.file_type,
+            url=f"/static/{row.filename}"
+        )
+        for row in rows
+    ]
     
     return FilesListResponse(
         files=files_info,
-        total_count=len(files_info)
+        total_count=total_count,
+        next_cursor=next_cursor
     )
 
 @app.get("/files/grouped", response_model=GroupedFilesResponse)
-async def list_grouped_files():
+async def list_grouped_files(
+    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: str = Query("timestamp", pattern="^(timestamp|size|name)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$")
+):
     """List files grouped by UUID for better UX"""
-    import re
-    from collections import defaultdict
-    
-    groups = defaultdict(lambda: {
-        'original_url': None,
-        'depth_map_url': None,
-        'dxf_url': None,
-        'timestamp': None,
-        'total_size': 0,
-        'files': []
-    })
-    
-    uuid_pattern = r'([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})'
-    
-    # Group files by UUID
-    for file_path in STATIC_DIR.glob("*"):
-        if file_path.is_file() and file_path.suffix in ['.png', '.jpg', '.jpeg', '.dxf']:
-            match = re.search(uuid_pattern, file_path.name)
-            if match:
-                uuid = match.group(1)
-                stat = file_path.stat()
-                url = f"/static/{file_path.name}"
-                
-                group = groups[uuid]
-                group['files'].append(file_path)
-                group['total_size'] += stat.st_size
-                
-                # Update timestamp to the most recent file with timezone awareness
-                file_time = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
-                if not group['timestamp'] or file_time > group['timestamp']:
-                    group['timestamp'] = file_time
-                
-                # Assign URLs based on file type
-                if file_path.name.startswith('original_'):
-                    group['original_url'] = url
-                elif file_path.name.startswith('depth_map_'):
-                    group['depth_map_url'] = url
-                elif file_path.name.startswith('output_'):
-                    group['dxf_url'] = url
-    
-    # Convert to response format
-    grouped_files = []
-    for uuid, data in groups.items():
-        if data['timestamp']:  # Only include groups with files
-            grouped_files.append(GroupedFile(
-                uuid=uuid,
-                original_url=data['original_url'],
-                depth_map_url=data['depth_map_url'],
-                dxf_url=data['dxf_url'],
-                timestamp=data['timestamp'],
-                total_size=data['total_size']
-            ))
+    sort_column = {"timestamp": CatalogGroup.modified_at, "size": CatalogGroup.total_size, "name": CatalogGroup.uuid}[sort]
+    query = db.query(CatalogGroup, func.count().over()) if not cursor else db.query(CatalogGroup)
+    try:
+        rows, next_cursor = page(query, sort_column, CatalogGroup.id, order == "desc", limit, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     
-    # Sort by timestamp (newest first)
-    grouped_files.sort(key=lambda x: x.timestamp, reverse=True)
+    total_groups = None if cursor else (rows[0][1] if rows else 0)
+    if not cursor:
+        rows = [row for row, _ in rows]
+    
+    grouped_files = [
+        GroupedFile(
+            uuid=row.uuid,
+            original_url=f"/static/{row.original_filename}" if row.original_filename else None,
+            depth_map_url=f"/static/{row.depth_map_filename}" if row.depth_map_filename else None,
+            dxf_url=f"/static/{row.dxf_filename}" if row.dxf_filename else None,
+            timestamp=row.modified_at.replace(tzinfo=timezone.utc),
+            total_size=row.total_size
+        )
+        for row in rows
+    ]
     
     return GroupedFilesResponse(
         groups=grouped_files,
-        total_groups=len(grouped_files)
+        total_groups=total_groups,
+        next_cursor=next_cursor
     )
 
 @app.delete("/files/{filename}")
-async def delete_file(filename: str):
+async def delete_file(filename: str, db: Session = Depends(get_db)):
     """Delete a specific file and its related files"""
     file_path = STATIC_DIR / filename
     
@@ -861,37 +1500,60 @@ async def delete_file(filename: str):
         if match:
             uuid = match.group(1)
             # Delete all related files with the same UUID
-            related_files = [
-                f"original_{uuid}.png",
-                f"original_{uuid}.jpg", 
-                f"original_{uuid}.jpeg",
-                f"depth_map_{uuid}.png",
-                f"output_{uuid}.dxf"
-            ]
+            related_files = conversion_files(uuid)
+            
+            # Identical conversions share one set of files, so another project may still use them
+            projects_using = db.query(func.count(func.distinct(ProjectFile.project_id))).filter(
+                ProjectFile.filename.in_(related_files)
+            ).scalar()
+            if projects_using:
+                raise HTTPException(409, f"File is still used by {projects_using} project(s); delete those projects first")
             
             deleted_files = []
+            stored_originals = []
             for related_file in related_files:
                 related_path = STATIC_DIR / related_file
                 if related_path.exists():
+                    if related_file.startswith("original_"):
+                        # Originals are stored once per content; find the blob behind this link
+                        stored_originals.append((file_content_hash(str(related_path)), related_path.suffix))
                     related_path.unlink()
                     deleted_files.append(related_file)
             
+            for content_hash, suffix in stored_originals:
+                prune_original(content_hash, suffix)
+            update_catalog(db, deleted_files)
+            
             return {"message": f"Deleted {len(deleted_files)} related files", "deleted": deleted_files}
         else:
             # If no UUID found, just delete the single file
             file_path.unlink()
+            update_catalog(db, [filename])
             return {"message": f"File {filename} deleted successfully"}
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Failed to delete file: {str(e)}")
 
 @app.on_event("startup")
 async def startup_event():
-    """Pre-load the model on startup"""
+    """Pre-load the model and start the conversion job dispatcher and catalogue rescans"""
+    global job_dispatcher_task, catalog_rescan_task
+    if TORCH_NUM_THREADS > 0:
+        torch.set_num_threads(TORCH_NUM_THREADS)
     try:
         get_depth_estimator()
     except Exception as e:
         print(f"Warning: Failed to pre-load model: {e}")
+    
+    if requeue_jobs_on_startup:
+        try:
+            requeue_interrupted_jobs()
+        except Exception as e:
+            print(f"Warning: Failed to requeue conversion jobs: {e}")
+    job_dispatcher_task = asyncio.create_task(job_dispatcher())
+    catalog_rescan_task = asyncio.create_task(catalog_rescanner())
 
 if __name__ == "__main__":
     import uvicorn
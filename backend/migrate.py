@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Schema migrations for Crystal Etching Converter
+Applies the numbered steps in migrations/ in order and records each one in schema_migrations
+
+Usage:
+    python migrate.py                  Upgrade to the latest version
+    python migrate.py up [VERSION]     Upgrade to VERSION
+    python migrate.py down VERSION     Roll back every migration above VERSION (0 for all)
+    python migrate.py status           List migrations and whether they are applied
+
+Each migration is a file NNNN_name.py defining up(conn) and down(conn). MySQL
+commits DDL implicitly, so a step that fails halfway cannot be rolled back
+there; steps therefore check what already exists (through the helpers below)
+and can simply be re-run. The same checks let an existing database that was
+built by create_all or the old one-off scripts adopt the history in place.
+"""
+import re
+import sys
+import argparse
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+MIGRATION_FILENAME = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration:
+    def __init__(self, version: int, name: str, path: Path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f"migration_{self.version:04d}", self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    def __repr__(self):
+        return f"{self.version:04d}_{self.name}"
+
+
+def discover() -> List[Migration]:
+    """Migrations in migrations/, ordered by version"""
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.py"):
+        match = MIGRATION_FILENAME.match(path.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError("Duplicate migration versions in migrations/")
+    return migrations
+
+
+def applied_versions(engine: Engine) -> set:
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        return {row.version for row in conn.execute(schema_migrations.select())}
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """Apply pending migrations up to target (default: all), returning those applied"""
+    applied = applied_versions(engine)
+    done = []
+    for migration in discover():
+        if target is not None and migration.version > target:
+            break
+        if migration.version in applied:
+            continue
+        print(f"Applying {migration}")
+        with engine.begin() as conn:
+            migration.module.up(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+            ))
+        done.append(migration)
+    return done
+
+
+def downgrade(engine: Engine, target: int) -> List[Migration]:
+    """Roll back applied migrations above target, newest first, returning those reverted"""
+    applied = applied_versions(engine)
+    done = []
+    for migration in reversed(discover()):
+        if migration.version <= target or migration.version not in applied:
+            continue
+        print(f"Reverting {migration}")
+        with engine.begin() as conn:
+            migration.module.down(conn)
+            conn.execute(schema_migrations.delete().where(schema_migrations.c.version == migration.version))
+        done.append(migration)
+    return done
+
+
+# Helpers for migration steps; each one is a no-op when the change is already in place
+
+def _quote(conn: Connection, name: str) -> str:
+    return conn.dialect.identifier_preparer.quote(name)
+
+
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_index(conn: Connection, table: str, name: str) -> bool:
+    inspector = inspect(conn)
+    # MySQL reports unique indexes as both; SQLite only as indexes
+    return any(i["name"] == name for i in inspector.get_indexes(table) + inspector.get_unique_constraints(table))
+
+
+def create_table(conn: Connection, table: Table) -> None:
+    """Create a table together with its indexes"""
+    table.create(conn, checkfirst=True)
+
+
+def drop_table(conn: Connection, table: str) -> None:
+    if has_table(conn, table):
+        conn.execute(text(f"DROP TABLE {_quote(conn, table)}"))
+
+
+def add_column(conn: Connection, table: str, column: Column) -> None:
+    if has_column(conn, table, column.name):
+        return
+    # Bind the column to a throwaway table so it compiles on its own
+    Table(table, MetaData(), column)
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {_quote(conn, table)} ADD COLUMN {ddl}"))
+
+
+def drop_column(conn: Connection, table: str, column: str) -> None:
+    if has_column(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {_quote(conn, table)} DROP COLUMN {_quote(conn, column)}"))
+
+
+def create_index(conn: Connection, table: str, name: str, columns: List[str], unique: bool = False) -> None:
+    """Create an index without blocking writes on MySQL
+
+    ALGORITHM=INPLACE, LOCK=NONE makes MySQL fail outright rather than fall
+    back to copying or locking the table, so a deploy never stalls traffic.
+    """
+    if has_index(conn, table, name):
+        return
+    column_list = ", ".join(_quote(conn, column) for column in columns)
+    ddl = f"CREATE {'UNIQUE ' if unique else ''}INDEX {_quote(conn, name)} ON {_quote(conn, table)} ({column_list})"
+    if conn.dialect.name == "mysql":
+        ddl += " ALGORITHM=INPLACE LOCK=NONE"
+    conn.execute(text(ddl))
+
+
+def drop_index(conn: Connection, table: str, name: str) -> None:
+    if not has_index(conn, table, name):
+        return
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"DROP INDEX {_quote(conn, name)} ON {_quote(conn, table)} ALGORITHM=INPLACE LOCK=NONE"))
+    else:
+        conn.execute(text(f"DROP INDEX {_quote(conn, name)}"))
+
+
+def status(engine: Engine) -> None:
+    applied = applied_versions(engine)
+    for migration in discover():
+        print(f"[{'x' if migration.version in applied else ' '}] {migration}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or revert schema migrations")
+    commands = parser.add_subparsers(dest="command")
+    up_parser = commands.add_parser("up", help="Apply pending migrations")
+    up_parser.add_argument("version", type=int, nargs="?", help="Stop after this version")
+    down_parser = commands.add_parser("down", help="Revert migrations above a version")
+    down_parser.add_argument("version", type=int, help="Version to keep (0 reverts everything)")
+    commands.add_parser("status", help="Show applied and pending migrations")
+    args = parser.parse_args()
+
+    from database import engine
+
+    try:
+        if args.command == "status":
+            status(engine)
+            return
+        if args.command == "down":
+            done = downgrade(engine, args.version)
+        else:
+            done = upgrade(engine, getattr(args, "version", None))
+        print(f"Migration completed successfully ({len(done)} step{'' if len(done) == 1 else 's'})")
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
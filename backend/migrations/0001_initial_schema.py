@@ -0,0 +1,59 @@
+"""Users, projects and project files as first created by init_db.py"""
+
+from datetime import datetime
+
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey
+
+from migrate import create_table, drop_table
+
+metadata = MetaData()
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String(255), unique=True, index=True, nullable=False),
+    Column("username", String(100), unique=True, index=True, nullable=False),
+    Column("password_hash", String(255), nullable=False),
+    Column("is_active", Boolean, default=True),
+    Column("is_admin", Boolean, default=False),
+    Column("created_at", DateTime, default=datetime.utcnow),
+    Column("updated_at", DateTime, default=datetime.utcnow),
+)
+
+projects = Table(
+    "projects", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("name", String(255), nullable=False),
+    Column("description", Text),
+    Column("uuid", String(36), unique=True, index=True, nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("blur_amount", Float),
+    Column("contrast", Float),
+    Column("brightness", Integer),
+    Column("edge_enhancement", Float),
+    Column("invert_depth", Boolean),
+)
+
+project_files = Table(
+    "project_files", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("file_type", String(50), nullable=False),
+    Column("filename", String(255), nullable=False),
+    Column("file_path", String(500), nullable=False),
+    Column("file_size", Integer),
+    Column("mime_type", String(100)),
+    Column("created_at", DateTime),
+)
+
+
+def up(conn):
+    for table in (users, projects, project_files):
+        create_table(conn, table)
+
+
+def down(conn):
+    for table in ("project_files", "projects", "users"):
+        drop_table(conn, table)
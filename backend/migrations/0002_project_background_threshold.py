@@ -0,0 +1,13 @@
+"""Per-project background threshold, formerly add_background_threshold.py"""
+
+from sqlalchemy import Column, Integer, text
+
+from migrate import add_column, drop_column
+
+
+def up(conn):
+    add_column(conn, "projects", Column("background_threshold", Integer, server_default=text("10")))
+
+
+def down(conn):
+    drop_column(conn, "projects", "background_threshold")
@@ -0,0 +1,35 @@
+"""Queue behind the asynchronous /jobs API, formerly add_conversion_jobs.py"""
+
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, Text, ForeignKey
+
+from migrate import create_table, drop_table
+
+metadata = MetaData()
+
+# Referenced by the foreign key only
+Table("users", metadata, Column("id", Integer, primary_key=True))
+
+conversion_jobs = Table(
+    "conversion_jobs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("uuid", String(36), unique=True, index=True, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=True),
+    Column("state", String(20), nullable=False, index=True),
+    Column("stage", String(20), nullable=False),
+    Column("parameters", Text, nullable=False),
+    Column("original_filename", String(255), nullable=False),
+    Column("project_name", String(255)),
+    Column("project_description", Text),
+    Column("error", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("finished_at", DateTime),
+)
+
+
+def up(conn):
+    create_table(conn, conversion_jobs)
+
+
+def down(conn):
+    drop_table(conn, "conversion_jobs")
@@ -0,0 +1,45 @@
+"""File catalogue behind /files and /files/grouped, formerly add_file_catalog.py
+
+The tables start empty; the API's startup rescan fills them from static/.
+"""
+
+from sqlalchemy import MetaData, Table, Column, Index, Integer, BigInteger, String, DateTime
+
+from migrate import create_table, drop_table
+
+metadata = MetaData()
+
+file_catalog = Table(
+    "file_catalog", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("filename", String(255), unique=True, index=True, nullable=False),
+    Column("group_uuid", String(36), index=True),
+    Column("file_type", String(50), nullable=False),
+    Column("size", BigInteger, nullable=False),
+    Column("modified_at", DateTime, nullable=False),
+    Index("ix_file_catalog_modified", "modified_at", "id"),
+    Index("ix_file_catalog_size", "size", "id"),
+)
+
+file_catalog_groups = Table(
+    "file_catalog_groups", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("uuid", String(36), unique=True, index=True, nullable=False),
+    Column("original_filename", String(255)),
+    Column("depth_map_filename", String(255)),
+    Column("dxf_filename", String(255)),
+    Column("total_size", BigInteger, nullable=False),
+    Column("modified_at", DateTime, nullable=False),
+    Index("ix_file_catalog_groups_modified", "modified_at", "id"),
+    Index("ix_file_catalog_groups_size", "total_size", "id"),
+)
+
+
+def up(conn):
+    create_table(conn, file_catalog)
+    create_table(conn, file_catalog_groups)
+
+
+def down(conn):
+    drop_table(conn, "file_catalog_groups")
+    drop_table(conn, "file_catalog")
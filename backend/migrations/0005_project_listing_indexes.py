@@ -0,0 +1,18 @@
+"""Composite indexes for keyset project listing and project file lookups, formerly add_project_indexes.py"""
+
+from migrate import create_index, drop_index
+
+
+def up(conn):
+    create_index(conn, "projects", "ix_projects_user_created", ["user_id", "created_at", "id"])
+    create_index(conn, "project_files", "ix_project_files_project_type", ["project_id", "file_type"])
+
+
+def down(conn):
+    if conn.dialect.name == "mysql":
+        # InnoDB drops its implicit foreign key index once a composite one covers the column,
+        # so give each foreign key a plain index back before removing the composite
+        create_index(conn, "projects", "ix_projects_user_id", ["user_id"])
+        create_index(conn, "project_files", "ix_project_files_project_id", ["project_id"])
+    drop_index(conn, "project_files", "ix_project_files_project_type")
+    drop_index(conn, "projects", "ix_projects_user_created")
@@ -0,0 +1,13 @@
+"""Process that claimed each running conversion job, so a crashed worker's jobs can be requeued"""
+
+from sqlalchemy import Column, Integer
+
+from migrate import add_column, drop_column
+
+
+def up(conn):
+    add_column(conn, "conversion_jobs", Column("worker_pid", Integer))
+
+
+def down(conn):
+    drop_column(conn, "conversion_jobs", "worker_pid")
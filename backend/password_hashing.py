@@ -0,0 +1,91 @@
+"""
+Password hashing for Crystal Etching Converter
+Runs bcrypt on a small bounded pool and shapes login concurrency per account and per client IP
+"""
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+import bcrypt
+from fastapi import HTTPException
+from dotenv import load_dotenv
+
+from executor import BoundedExecutor
+
+load_dotenv()
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))  # Cost factor; older hashes are upgraded at login
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", 64))  # Waiting hashes beyond busy workers
+LOGIN_ACCOUNT_CONCURRENCY = int(os.getenv("LOGIN_ACCOUNT_CONCURRENCY", 1))
+LOGIN_IP_CONCURRENCY = int(os.getenv("LOGIN_IP_CONCURRENCY", 4))
+LOGIN_MAX_WAITING = int(os.getenv("LOGIN_MAX_WAITING", 8))  # Queued attempts per account or IP before 429
+LOGIN_RETRY_AFTER_SECONDS = int(os.getenv("LOGIN_RETRY_AFTER_SECONDS", 5))
+
+# bcrypt releases the GIL while hashing, so threads run it in parallel without stalling the event loop
+_password_pool = BoundedExecutor(
+    PASSWORD_HASH_WORKERS, PASSWORD_QUEUE_LIMIT, "bcrypt",
+    "Too many sign-ins in progress, please retry shortly", LOGIN_RETRY_AFTER_SECONDS
+)
+
+
+def hash_password(password: str, rounds: int = None) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)).decode('utf-8')
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True when a stored hash ($2b$<cost>$...) was made with a different cost factor"""
+    try:
+        return int(password_hash.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def run_password_job(func, *args):
+    """Run hash_password or check_password on the bcrypt pool, with 503 once its queue is full"""
+    return await _password_pool.run(func, *args)
+
+
+class ConcurrencyShaper:
+    """Per-key concurrency limit with a bounded wait queue; used from the event loop only"""
+
+    def __init__(self, limit: int, max_waiting: int):
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self._slots: Dict[str, List] = {}  # key -> [semaphore, holders + waiters]
+
+    @asynccontextmanager
+    async def slot(self, key: str):
+        entry = self._slots.get(key)
+        if entry is None:
+            entry = self._slots[key] = [asyncio.Semaphore(self.limit), 0]
+        if entry[1] >= self.limit + self.max_waiting:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many sign-in attempts, please retry shortly",
+                headers={"Retry-After": str(LOGIN_RETRY_AFTER_SECONDS)},
+            )
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._slots[key]
+
+
+account_shaper = ConcurrencyShaper(LOGIN_ACCOUNT_CONCURRENCY, LOGIN_MAX_WAITING)
+ip_shaper = ConcurrencyShaper(LOGIN_IP_CONCURRENCY, LOGIN_MAX_WAITING)
+
+
+@asynccontextmanager
+async def login_slot(account: str, client_ip: str):
+    """Hold one sign-in slot for this client IP and this account"""
+    async with ip_shaper.slot(client_ip), account_shaper.slot(account.lower()):
+        yield
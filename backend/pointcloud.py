@@ -0,0 +1,148 @@
+"""
+Point cloud extraction for Crystal Etching Converter
+Turns a grayscale depth map into an Nx3 array of etching coordinates (mm)
+"""
+import os
+import json
+from typing import List, Optional
+
+import numpy as np
+import cv2
+
+# Each depth map pixel is 0.1mm on the crystal
+PIXEL_PITCH_MM = 0.1
+# Binary point cloud layout: interleaved little-endian float32 x, y, z
+POINTS_DTYPE = np.dtype('<f4')
+# Grid cell edge in pixels for each LOD level; level n keeps roughly 1/4**n of the points
+LOD_CELL_PIXELS = (2, 4, 8)
+
+
+def background_mask(depth_image: np.ndarray, original_image: Optional[np.ndarray] = None,
+                    background_threshold: int = 10) -> np.ndarray:
+    """Boolean mask of pixels that become points (True = keep)"""
+    if original_image is not None:
+        if original_image.shape != depth_image.shape:
+            original_image = cv2.resize(
+                original_image, (depth_image.shape[1], depth_image.shape[0]),
+                interpolation=cv2.INTER_NEAREST
+            )
+        # Exclude dark areas in the original image
+        mask = original_image > background_threshold
+    else:
+        # Fallback to depth map threshold
+        mask = depth_image > background_threshold
+
+    # Zero depth never produces a point
+    mask &= depth_image > 0
+    return mask
+
+
+def extract_points(depth_image: np.ndarray, max_depth_mm: float,
+                   original_image: Optional[np.ndarray] = None,
+                   background_threshold: int = 10) -> np.ndarray:
+    """Convert a uint8 depth map into an (N, 3) float32 array of x, y, z in mm
+
+    Points are centered on the origin with Y flipped, in row-major pixel order.
+    Z maps 0-255 onto MAX_DEPTH_MM shifted down by a quarter of its range.
+    """
+    height, width = depth_image.shape
+    mask = background_mask(depth_image, original_image, background_threshold)
+    ys, xs = np.nonzero(mask)
+
+    points = np.empty((len(xs), 3), dtype=np.float32)
+    points[:, 0] = (xs - width / 2.0) * PIXEL_PITCH_MM
+    points[:, 1] = (height / 2.0 - ys) * PIXEL_PITCH_MM
+    points[:, 2] = depth_image[ys, xs] / 255.0 * max_depth_mm - (max_depth_mm / 4.0)
+    return points
+
+
+def save_points(points: np.ndarray, path: str) -> None:
+    """Write an (N, 3) array as raw little-endian float32 triples"""
+    points.astype(POINTS_DTYPE, copy=False).tofile(path)
+
+
+def load_points(path: str) -> np.ndarray:
+    """Memory-map a binary point cloud as a read-only (N, 3) array"""
+    if os.path.getsize(path) == 0:
+        return np.empty((0, 3), dtype=POINTS_DTYPE)
+    return np.memmap(path, dtype=POINTS_DTYPE, mode='r').reshape(-1, 3)
+
+
+def grid_downsample(points: np.ndarray, cell_pixels: int) -> np.ndarray:
+    """Replace the points in each cell_pixels x cell_pixels square of the pixel grid by their centroid
+
+    Binning ignores Z: a grey level is already ~0.2mm of depth, so cubic voxels
+    would split almost every neighbourhood and barely reduce the cloud.
+    """
+    if len(points) == 0:
+        return points.astype(POINTS_DTYPE, copy=True)
+    # Back to integer pixel positions before binning, so float error cannot move a point across a cell edge
+    cells = np.floor_divide(np.rint(points[:, :2] / PIXEL_PITCH_MM).astype(np.int64), cell_pixels)
+    cells -= cells.min(axis=0)
+    keys = cells[:, 1] * (cells[:, 0].max() + 1) + cells[:, 0]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+    centroids = np.empty((len(counts), 3), dtype=POINTS_DTYPE)
+    for axis in range(3):
+        centroids[:, axis] = np.bincount(inverse, weights=points[:, axis], minlength=len(counts)) / counts
+    return centroids
+
+
+def lod_path(points_path: str, level: int) -> str:
+    """File holding one pyramid level; level 0 is the full cloud itself"""
+    if level == 0:
+        return points_path
+    root, ext = os.path.splitext(points_path)
+    return f"{root}_lod{level}{ext}"
+
+
+def meta_path(points_path: str) -> str:
+    """Sidecar JSON holding the full cloud's count and bounds plus every level's count"""
+    return f"{os.path.splitext(points_path)[0]}.json"
+
+
+def save_point_meta(points: np.ndarray, points_path: str, level_counts: List[int]) -> dict:
+    """Describe a cloud once at write time, so serving it never has to scan the points"""
+    meta = {"count": len(points), "levels": level_counts, "bounds": None}
+    if len(points):
+        mins, maxs = points.min(axis=0), points.max(axis=0)
+        meta["bounds"] = [round(float(value), 4) for axis in range(3) for value in (mins[axis], maxs[axis])]
+    with open(meta_path(points_path), 'w') as f:
+        json.dump(meta, f)
+    return meta
+
+
+def load_point_meta(points_path: str) -> dict:
+    """Read a cloud's sidecar, rebuilding it for clouds written before sidecars existed"""
+    try:
+        with open(meta_path(points_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        level_counts = [
+            os.path.getsize(lod_path(points_path, level)) // POINTS_DTYPE.itemsize // 3
+            if os.path.exists(lod_path(points_path, level)) else 0
+            for level in range(len(LOD_CELL_PIXELS) + 1)
+        ]
+        return save_point_meta(load_points(points_path), points_path, level_counts)
+
+
+def decimate_points(path: str, max_points: int) -> bytes:
+    """Every n-th point of a binary cloud, with n chosen to return at most max_points"""
+    points = load_points(path)
+    stride = -(-len(points) // max_points)
+    return np.ascontiguousarray(points[::stride]).tobytes()
+
+
+def save_lod_pyramid(points: np.ndarray, points_path: str) -> List[int]:
+    """Write the full cloud, each grid-downsampled level and the sidecar, returning point counts per level
+
+    The sidecar is written last, so its presence marks a complete pyramid.
+    """
+    save_points(points, points_path)
+    counts = [len(points)]
+    for level, cell_pixels in enumerate(LOD_CELL_PIXELS, start=1):
+        level_points = grid_downsample(points, cell_pixels)
+        save_points(level_points, lod_path(points_path, level))
+        counts.append(len(level_points))
+    save_point_meta(points, points_path, counts)
+    return counts
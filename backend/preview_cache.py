@@ -0,0 +1,110 @@
+"""
+Preview cache for Crystal Etching Converter
+Keeps encoded depth map previews in a byte-bounded LRU with a time-to-live
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+from shared_cache import SharedDiskCache, shared_cache
+
+load_dotenv()
+
+PREVIEW_CACHE_MB = int(os.getenv("PREVIEW_CACHE_MB", 32))
+PREVIEW_CACHE_TTL = int(os.getenv("PREVIEW_CACHE_TTL", 60))  # Seconds an entry stays valid
+
+
+class PreviewCache:
+    """Thread-safe LRU of encoded preview bytes with a byte budget and per-entry TTL"""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, shared: Optional[SharedDiskCache] = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # Previews are keyed by everything that shapes them, so the shared tier needs no TTL of its own
+        self.shared = shared
+        self._entries = OrderedDict()  # key -> (data, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _remove(self, key: str) -> None:
+        data, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at >= self.ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, stored_at = entry
+                if not self._expired(stored_at, time.monotonic()):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return data
+                self._remove(key)
+                self.expirations += 1
+
+        # Rendered by another worker, or expired here but still on disk
+        data = self.shared.get_bytes("preview", key) if self.shared else None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if self.shared:
+            self.shared.put_bytes("preview", key, data)
+        self._remember(key, data)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, now)
+            self._bytes += len(data)
+
+            # Expired entries collect at the cold end, so sweeping from there is cheap
+            while self._entries:
+                oldest_key, (_, stored_at) = next(iter(self._entries.items()))
+                if not self._expired(stored_at, now):
+                    break
+                self._remove(oldest_key)
+                self.expirations += 1
+
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "shared": self.shared.stats() if self.shared else None,
+            }
+
+
+preview_cache = PreviewCache(PREVIEW_CACHE_MB * 1024 * 1024, PREVIEW_CACHE_TTL, shared_cache)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pre-fork server for Crystal Etching Converter
+Loads the depth model once, then forks uvicorn workers that share its weight pages copy-on-write
+
+Usage: python serve.py [--workers N]
+`uvicorn --workers` spawns fresh interpreters, so every worker would load its
+own copy of the model. Here the parent loads it before forking and never
+touches it again, so the weight pages stay shared read-only between workers.
+"""
+
+import os
+import gc
+import sys
+import time
+import signal
+import argparse
+
+import torch
+import uvicorn
+from dotenv import load_dotenv
+
+load_dotenv()
+
+API_WORKERS = int(os.getenv("API_WORKERS", 1))
+RESPAWN_DELAY_SECONDS = 1
+# ONNX Runtime sessions own thread pools that do not survive fork, so that backend loads per worker
+PREFORK_BACKENDS = {"pipeline", "torch_int8"}
+
+
+def worker_threads(workers: int) -> int:
+    """Torch intra-op threads per worker, splitting the cores unless TORCH_NUM_THREADS is set"""
+    from main import TORCH_NUM_THREADS
+    if TORCH_NUM_THREADS > 0:
+        return TORCH_NUM_THREADS
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def prepare_parent() -> None:
+    """Everything workers should inherit instead of repeating: model load and job recovery"""
+    import main
+    import database
+
+    if main.DEPTH_BACKEND in PREFORK_BACKENDS:
+        # One thread while loading, so no OpenMP pool exists in the parent at fork time
+        torch.set_num_threads(1)
+        main.get_depth_estimator()
+    else:
+        print(f"{main.DEPTH_BACKEND} backend cannot be shared across fork, each worker loads its own")
+
+    # Once here rather than in each worker, where a respawned worker would requeue its siblings' jobs;
+    # after that the supervisor requeues just the jobs of each worker it reaps
+    try:
+        main.requeue_interrupted_jobs()
+    except Exception as e:
+        print(f"Warning: Failed to requeue conversion jobs: {e}")
+    main.requeue_jobs_on_startup = False
+
+    # Connections must not be shared between processes
+    database.engine.dispose()
+    # Keep the garbage collector from writing to (and so copying) every inherited object
+    gc.freeze()
+
+
+def requeue_worker_jobs(pid: int) -> None:
+    """Requeue the jobs a dead worker had claimed, without leaving connections for the next fork"""
+    import main
+    import database
+
+    try:
+        main.requeue_interrupted_jobs(pid)
+    except Exception as e:
+        print(f"Warning: Failed to requeue jobs of worker {pid}: {e}")
+    finally:
+        database.engine.dispose()
+
+
+def run_worker(config: uvicorn.Config, sock, threads: int) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    torch.set_num_threads(threads)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(workers: int) -> None:
+    import main
+
+    config = uvicorn.Config(
+        main.app,
+        host=os.getenv("API_HOST", "0.0.0.0"),
+        port=int(os.getenv("API_PORT", 8000))
+    )
+    threads = worker_threads(workers)
+    if workers <= 1:
+        torch.set_num_threads(threads)
+        uvicorn.Server(config).run()
+        return
+
+    prepare_parent()
+    sock = config.bind_socket()
+    print(f"Starting {workers} workers with {threads} torch threads each")
+
+    children = {}
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(config, sock, threads)
+            finally:
+                os._exit(0)
+        children[pid] = slot
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for slot in range(workers):
+        spawn(slot)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        print(f"Worker {pid} exited with status {status}, restarting")
+        requeue_worker_jobs(pid)
+        time.sleep(RESPAWN_DELAY_SECONDS)
+        spawn(slot)
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked workers sharing one model load")
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="Worker processes (default: API_WORKERS)")
+    args = parser.parse_args()
+    sys.exit(serve(args.workers))
@@ -0,0 +1,151 @@
+"""
+Shared disk cache for Crystal Etching Converter
+Lets every uvicorn worker reuse raw depth and previews computed by another, through files under one directory
+"""
+import os
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; the cache then only coordinates threads
+    fcntl = None
+
+load_dotenv()
+
+SHARED_CACHE_DIR = os.getenv("SHARED_CACHE_DIR")  # Unset disables the shared tier
+SHARED_CACHE_MB = int(os.getenv("SHARED_CACHE_MB", 1024))
+
+
+class SharedDiskCache:
+    """Size-bounded cache of arrays and bytes in a directory shared between processes
+
+    Entries are written to a temp file and renamed into place, so readers never
+    take a lock and never see a partial entry. Arrays are memory-mapped on read,
+    which keeps one copy of their pages in the OS page cache however many
+    workers use them. Writers serialise on an flock'd lock file while they
+    evict least recently used entries (by mtime, refreshed on every hit) until
+    the directory fits its byte budget.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock_path = self.directory / ".lock"
+        self._thread_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, namespace: str, key: str, suffix: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()[:40]
+        return self.directory / f"{namespace}-{digest}{suffix}"
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Evicted by another worker after we opened it; the data we hold is still valid
+
+    def get_array(self, namespace: str, key: str) -> Optional[np.ndarray]:
+        """Read-only memory map of a cached array, or None"""
+        path = self._path(namespace, key, ".npy")
+        try:
+            array = np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            self._count(False)
+            return None
+        self._touch(path)
+        self._count(True)
+        return array
+
+    def get_bytes(self, namespace: str, key: str) -> Optional[bytes]:
+        path = self._path(namespace, key, ".bin")
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self._count(False)
+            return None
+        self._touch(path)
+        self._count(True)
+        return data
+
+    def put_array(self, namespace: str, key: str, array: np.ndarray) -> None:
+        if array.nbytes > self.max_bytes:
+            return
+        tmp_path = self._tmp_path()
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(array))
+        self._publish(tmp_path, self._path(namespace, key, ".npy"))
+
+    def put_bytes(self, namespace: str, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        tmp_path = self._tmp_path()
+        tmp_path.write_bytes(data)
+        self._publish(tmp_path, self._path(namespace, key, ".bin"))
+
+    def _tmp_path(self) -> Path:
+        return self.directory / f".{os.getpid()}-{threading.get_ident()}.tmp"
+
+    def _publish(self, tmp_path: Path, path: Path) -> None:
+        with self._thread_lock, open(self._lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            os.replace(tmp_path, path)
+            self._evict(keep=path)
+
+    def _evict(self, keep: Path) -> None:
+        # Called with the lock held; a directory scan is cheap next to the inference or render that preceded it
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                total += stat.st_size
+                if entry.path != str(keep):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            with self._stats_lock:
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "directory": str(self.directory),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+shared_cache = SharedDiskCache(SHARED_CACHE_DIR, SHARED_CACHE_MB * 1024 * 1024) if SHARED_CACHE_DIR else None
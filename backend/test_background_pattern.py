@@ -0,0 +1,50 @@
+"""
+Regression test for depth_processing.background_pattern_mask
+Compares the block-reduced checkerboard with the per-tile loop it replaced
+
+Run with: python -m pytest test_background_pattern.py
+"""
+import numpy as np
+
+from depth_processing import background_pattern_mask
+
+
+def loop_pattern(processed, threshold):
+    """Previous implementation from apply_depth_parameters"""
+    vis_copy = processed.copy()
+    mask = processed <= threshold
+    for y in range(0, processed.shape[0], 10):
+        for x in range(0, processed.shape[1], 10):
+            if mask[y:min(y+5, processed.shape[0]), x:min(x+5, processed.shape[1])].any():
+                vis_copy[y:min(y+5, processed.shape[0]), x:min(x+5, processed.shape[1])] = 0
+    return vis_copy
+
+
+def vectorized_pattern(processed, threshold):
+    vis_copy = processed.copy()
+    vis_copy[background_pattern_mask(processed <= threshold)] = 0
+    return vis_copy
+
+
+def test_matches_loop_on_random_maps():
+    """Random maps, including ragged edge tiles and all-or-nothing thresholds"""
+    rng = np.random.default_rng(0)
+    for height, width in [(1, 1), (4, 6), (7, 13), (10, 10), (11, 20), (95, 103), (480, 641)]:
+        depth = rng.integers(0, 256, (height, width), dtype=np.uint8)
+        for threshold in (0, 10, 128, 255):
+            assert np.array_equal(vectorized_pattern(depth, threshold), loop_pattern(depth, threshold)), \
+                f"Mismatch at {width}x{height}, threshold {threshold}"
+
+
+def test_matches_loop_on_sparse_background():
+    """Isolated background pixels, so single pixels decide whether a block is blanked"""
+    rng = np.random.default_rng(1)
+    depth = np.full((203, 157), 200, dtype=np.uint8)
+    depth[rng.integers(0, 203, 60), rng.integers(0, 157, 60)] = 0
+    assert np.array_equal(vectorized_pattern(depth, 10), loop_pattern(depth, 10))
+
+
+if __name__ == "__main__":
+    test_matches_loop_on_random_maps()
+    test_matches_loop_on_sparse_background()
+    print("background_pattern_mask matches the per-tile loop")
@@ -0,0 +1,106 @@
+"""
+Tiled depth inference for Crystal Etching Converter
+Runs overlapping tiles through the estimator and blends them into one high-detail map
+"""
+from typing import Callable, List
+
+import numpy as np
+import cv2
+from PIL import Image
+
+from depth_processing import working_size
+
+MIN_TILE_SIZE = 256  # Smaller tiles give the model too little context
+
+
+def tile_origins(length: int, tile: int, step: int) -> List[int]:
+    """Start offsets covering [0, length) with tiles of the given size and step"""
+    if length <= tile:
+        return [0]
+    origins = list(range(0, length - tile, step))
+    origins.append(length - tile)
+    return origins
+
+
+def feather_ramp(length: int, overlap: int, fade_start: bool, fade_end: bool) -> np.ndarray:
+    """1-D blend weights that fall off linearly across overlapping edges"""
+    ramp = np.ones(length, dtype=np.float32)
+    fade = min(overlap, length // 2)
+    if fade > 0:
+        edge = (np.arange(fade, dtype=np.float32) + 1) / (fade + 1)
+        if fade_start:
+            ramp[:fade] = edge
+        if fade_end:
+            ramp[-fade:] = edge[::-1]
+    return ramp
+
+
+def align_to_reference(depth: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Least-squares scale and shift mapping a tile's relative depth onto the reference"""
+    d = depth.ravel().astype(np.float64)
+    r = reference.ravel().astype(np.float64)
+    d_mean, r_mean = d.mean(), r.mean()
+    variance = ((d - d_mean) ** 2).mean()
+    if variance < 1e-12:
+        return np.full(depth.shape, r_mean, dtype=np.float32)
+    scale = ((d - d_mean) * (r - r_mean)).mean() / variance
+    shift = r_mean - scale * d_mean
+    return (depth * scale + shift).astype(np.float32)
+
+
+def estimate_tiled_depth(
+    image: Image.Image,
+    estimate_batch: Callable[[List[Image.Image]], List[np.ndarray]],
+    tile_size: int,
+    overlap: int,
+    batch_size: int = 4
+) -> np.ndarray:
+    """Relative depth at full image size assembled from overlapping tiles
+
+    A global pass at tile resolution fixes the overall depth layout; each tile
+    is aligned to it by scale and shift, then seams are feathered across the
+    overlap. Model memory is bounded by the tile size, not the image size.
+    """
+    tile_size = max(tile_size, MIN_TILE_SIZE)
+    overlap = min(overlap, tile_size // 2)
+    width, height = image.size
+
+    global_size = working_size(image.size, tile_size)
+    global_image = image.resize(global_size, Image.LANCZOS) if global_size != image.size else image
+    global_depth = estimate_batch([global_image])[0].astype(np.float32)
+    if global_size == image.size:
+        return global_depth
+
+    tile_w, tile_h = min(tile_size, width), min(tile_size, height)
+    step = tile_size - overlap
+    origins = [
+        (x, y)
+        for y in tile_origins(height, tile_h, step)
+        for x in tile_origins(width, tile_w, step)
+    ]
+
+    scale_x = global_depth.shape[1] / width
+    scale_y = global_depth.shape[0] / height
+    accumulated = np.zeros((height, width), dtype=np.float32)
+    weights = np.zeros((height, width), dtype=np.float32)
+
+    # Every tile has the same size, so batches need no padding
+    for start in range(0, len(origins), batch_size):
+        chunk = origins[start:start + batch_size]
+        tiles = [image.crop((x, y, x + tile_w, y + tile_h)) for x, y in chunk]
+        for (x, y), depth in zip(chunk, estimate_batch(tiles)):
+            region = global_depth[
+                int(y * scale_y):max(int(y * scale_y) + 1, int(round((y + tile_h) * scale_y))),
+                int(x * scale_x):max(int(x * scale_x) + 1, int(round((x + tile_w) * scale_x)))
+            ]
+            reference = cv2.resize(region, (tile_w, tile_h), interpolation=cv2.INTER_LINEAR)
+            aligned = align_to_reference(depth, reference)
+
+            weight = np.outer(
+                feather_ramp(tile_h, overlap, y > 0, y + tile_h < height),
+                feather_ramp(tile_w, overlap, x > 0, x + tile_w < width)
+            )
+            accumulated[y:y + tile_h, x:x + tile_w] += aligned * weight
+            weights[y:y + tile_h, x:x + tile_w] += weight
+
+    return accumulated / weights
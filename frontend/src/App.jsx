@@ -47,6 +47,7 @@ function App({ mode, setMode }) {
   })
   const [previewLoading, setPreviewLoading] = useState(false)
   const abortControllerRef = useRef(null)
+  const previewUrlRef = useRef(null)
 
   const handleFileSelect = (file) => {
     setSelectedFile(file)
@@ -333,20 +334,22 @@ function App({ mode, setMode }) {
       
       setPreviewLoading(true)
       try {
-        const response = await axios.post('/api/preview', {
-          image_url: results.original_url,
-          ...params
-        }, {
+        // Raw image bytes with an ETag, so the browser revalidates repeat previews
+        const response = await axios.get('/api/preview/image', {
+          params: { image_url: results.original_url, ...params },
+          responseType: 'blob',
           signal: abortControllerRef.current.signal
         })
         
         // Update the depth map preview
-        if (response.data.preview) {
-          setResults(prev => ({
-            ...prev,
-            depth_map_preview: response.data.preview
-          }))
+        if (previewUrlRef.current) {
+          URL.revokeObjectURL(previewUrlRef.current)
         }
+        previewUrlRef.current = URL.createObjectURL(response.data)
+        setResults(prev => ({
+          ...prev,
+          depth_map_preview: previewUrlRef.current
+        }))
       } catch (err) {
         // Don't log errors for aborted requests
         if (!axios.isCancel(err)) {
@@ -107,6 +107,24 @@ function Scene({ points, depthScale, autoRotate, onControlsChange }) {
   )
 }
 
+const MAX_DISPLAY_POINTS = 50000 // Limit for smooth rendering
+const COARSEST_LOD_LEVEL = 3 // Roughly 1/64 of the points, shown first
+
+// Converted DXFs have a binary float32 twin with grid-downsampled LOD levels
+function conversionIdFor(dxfUrl) {
+  const match = dxfUrl.match(/output_([a-f0-9-]{36})\.dxf$/)
+  return match ? match[1] : null
+}
+
+function parsePointBuffer(buffer) {
+  const coords = new Float32Array(buffer)
+  const points = new Array(coords.length / 3)
+  for (let i = 0; i < points.length; i++) {
+    points[i] = [coords[i * 3], coords[i * 3 + 1], coords[i * 3 + 2]]
+  }
+  return points
+}
+
 function parseDXF(dxfContent) {
   const points = []
   const lines = dxfContent.split('\n').map(line => line.trim())
@@ -238,6 +256,57 @@ function DXFViewer({ dxfUrl }) {
     setLoading(true)
     setLoadProgress(0)
     
+    const onDownloadProgress = (progressEvent) => {
+      if (progressEvent.total) {
+        const percentCompleted = Math.round((progressEvent.loaded * 80) / progressEvent.total)
+        setLoadProgress(10 + percentCompleted)
+      }
+    }
+    
+    // max_points keeps every fetch within the display cap, decimating server-side when a level is too big
+    const fetchPointLevel = (conversionId, level) => axios.get(`/api/points/${conversionId}`, {
+      params: { level, max_points: MAX_DISPLAY_POINTS },
+      responseType: 'arraybuffer',
+      signal: abortControllerRef.current.signal,
+      onDownloadProgress
+    })
+    
+    const loadBinaryPoints = async (conversionId) => {
+      // Coarse level first so something is on screen almost immediately
+      const coarse = await fetchPointLevel(conversionId, COARSEST_LOD_LEVEL)
+      setLoadProgress(90)
+      const coarsePoints = parsePointBuffer(coarse.data)
+      if (coarsePoints.length === 0) {
+        throw new Error('No points found in point cloud')
+      }
+      
+      // Stats describe the full cloud, not the level being shown
+      const [minX, maxX, minY, maxY, minZ, maxZ] = coarse.headers['x-point-bounds'].split(',').map(Number)
+      setStats({
+        pointCount: Number(coarse.headers['x-point-count']),
+        bounds: { minX, maxX, minY, maxY, minZ, maxZ }
+      })
+      setPoints(coarsePoints)
+      setLoadProgress(100)
+      setLoading(false)
+      
+      // Then refine to the finest level that still renders smoothly. When even the
+      // coarsest level is over the cap, the decimated coarse fetch is what gets shown
+      const levelCounts = coarse.headers['x-point-levels'].split(',').map(Number)
+      const refineLevel = levelCounts.findIndex(count => count > 0 && count <= MAX_DISPLAY_POINTS)
+      if (refineLevel === -1 || refineLevel >= COARSEST_LOD_LEVEL) {
+        return
+      }
+      try {
+        const fine = await fetchPointLevel(conversionId, refineLevel)
+        setPoints(parsePointBuffer(fine.data))
+      } catch (err) {
+        if (!axios.isCancel(err)) {
+          console.warn('Keeping coarse point cloud:', err.message)
+        }
+      }
+    }
+    
     const loadDXF = async () => {
       // Create new abort controller
       abortControllerRef.current = new AbortController()
@@ -245,15 +314,25 @@ function DXFViewer({ dxfUrl }) {
       try {
         setLoadProgress(10)
         
+        const conversionId = conversionIdFor(dxfUrl)
+        if (conversionId) {
+          try {
+            await loadBinaryPoints(conversionId)
+            return
+          } catch (err) {
+            if (axios.isCancel(err)) {
+              throw err
+            }
+            // Older conversions have no binary twin; parse the DXF instead
+            console.warn('Binary point cloud unavailable, falling back to DXF:', err.message)
+            setLoadProgress(10)
+          }
+        }
+        
         const response = await axios.get(dxfUrl, {
           responseType: 'text',
           signal: abortControllerRef.current.signal,
-          onDownloadProgress: (progressEvent) => {
-            if (progressEvent.total) {
-              const percentCompleted = Math.round((progressEvent.loaded * 80) / progressEvent.total)
-              setLoadProgress(10 + percentCompleted)
-            }
-          }
+          onDownloadProgress
         })
         
         setLoadProgress(90)
@@ -285,10 +364,9 @@ function DXFViewer({ dxfUrl }) {
         })
         
         // Sample points if there are too many (for performance)
-        const maxPoints = 50000 // Limit for smooth rendering
         let displayPoints = parsedPoints
-        if (parsedPoints.length > maxPoints) {
-          const sampleRate = Math.ceil(parsedPoints.length / maxPoints)
+        if (parsedPoints.length > MAX_DISPLAY_POINTS) {
+          const sampleRate = Math.ceil(parsedPoints.length / MAX_DISPLAY_POINTS)
           displayPoints = parsedPoints.filter((_, index) => index % sampleRate === 0)
           console.log(`Sampling ${parsedPoints.length} points to ${displayPoints.length} for display`)
         }
@@ -35,6 +35,8 @@ function FileBrowserNew({ onLoadFiles, compact = false }) {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [searchTerm, setSearchTerm] = useState('')
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   
   const loadFiles = async () => {
     setLoading(true)
@@ -43,6 +45,7 @@ function FileBrowserNew({ onLoadFiles, compact = false }) {
     try {
       const response = await axios.get('/api/files/grouped')
       setGroups(response.data.groups)
+      setNextCursor(response.data.next_cursor)
     } catch (err) {
       setError('Failed to load files')
       console.error(err)
@@ -51,6 +54,19 @@ function FileBrowserNew({ onLoadFiles, compact = false }) {
     }
   }
   
+  const loadMore = async () => {
+    setLoadingMore(true)
+    try {
+      const response = await axios.get('/api/files/grouped', { params: { cursor: nextCursor } })
+      setGroups(prev => [...prev, ...response.data.groups])
+      setNextCursor(response.data.next_cursor)
+    } catch (err) {
+      console.error('Failed to load more files:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+  
   useEffect(() => {
     loadFiles()
   }, [])
@@ -245,6 +261,14 @@ function FileBrowserNew({ onLoadFiles, compact = false }) {
           ))}
         </List>
       )}
+      
+      {nextCursor && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 1 }}>
+          <Button size="small" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </Button>
+        </Box>
+      )}
     </Box>
   )
 }
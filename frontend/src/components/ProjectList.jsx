@@ -10,6 +10,7 @@ import {
   IconButton,
   Tooltip,
   Fade,
+  Button,
 } from '@mui/material';
 import {
   Search as SearchIcon,
@@ -24,6 +25,8 @@ function ProjectList({ onLoadProject }) {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { user } = useAuth();
 
   const fetchProjects = async () => {
@@ -33,6 +36,7 @@ function ProjectList({ onLoadProject }) {
     try {
       const response = await axios.get('/api/projects');
       setProjects(response.data.projects || []);
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
       setError('Failed to load projects. Please try again.');
       console.error('Error fetching projects:', err);
@@ -41,6 +45,19 @@ function ProjectList({ onLoadProject }) {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await axios.get('/api/projects', { params: { cursor: nextCursor } });
+      setProjects(prev => [...prev, ...response.data.projects]);
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      console.error('Error loading more projects:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     if (user) {
       fetchProjects();
@@ -151,6 +168,14 @@ function ProjectList({ onLoadProject }) {
           ))}
         </Grid>
       )}
+
+      {!loading && nextCursor && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+          <Button size="small" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </Button>
+        </Box>
+      )}
     </Box>
   );
 }